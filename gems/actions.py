@@ -1,14 +1,52 @@
-from dataclasses import dataclass, field
-from collections.abc import Mapping
+from dataclasses import dataclass, field, replace
+from collections.abc import Callable, Hashable, Mapping
 from abc import ABC, abstractmethod
+from itertools import combinations
+from typing import TypeVar
+from weakref import WeakValueDictionary
 
 from .consts import GameConfig
-from .typings import Gem, ActionType, GemList, Card, CardIdx
-from .state import PlayerState, GameState
+from .typings import Gem, ActionType, GemList, Card, CardIdx, CardList
+from .state import PlayerState, GameState, _derive_state
 from .utils import _replace_tuple
 
 
-@dataclass(frozen=True)
+A = TypeVar('A', bound='Action')
+
+# hash-consed actions built by the `create` classmethods, keyed by their
+# constructor arguments; entries vanish once nothing else holds the action
+_INTERNED: 'WeakValueDictionary[Hashable, Action]' = WeakValueDictionary()
+
+
+def _intern(key: Hashable, build: Callable[[], A]) -> A:
+  """Return the live action interned under `key`, building it on a miss."""
+  action = _INTERNED.get(key)
+  if action is None:
+    action = build()
+    _INTERNED[key] = action
+  return action  # type: ignore[return-value]
+
+
+# Take3 actions needing no return, by (class, availability bitmask over
+# GemList.GEM_ORDER); holds strong references, so these stay interned for the
+# process
+_TAKE3_NO_RETURN: dict[tuple, tuple['Take3Action', ...]] = {}
+
+# GemList.GEM_ORDER slots a take-3 may draw from
+_NON_GOLD_SLOTS = tuple(GemList.GEM_ORDER.index(g) for g in GemList.NON_GOLD)
+
+
+def _mask_gems(mask: int) -> list[Gem]:
+  """Return the gems whose `GEM_ORDER` bit is set in `mask`, in that order."""
+  return [GemList.GEM_ORDER[i] for i in _NON_GOLD_SLOTS if mask >> i & 1]
+
+
+def _pairs_key(m: Mapping[Gem, int] | GemList | None) -> tuple | None:
+  # keeps insertion order, since the GemList built from `m` iterates in it
+  return tuple(dict(m).items()) if m else None
+
+
+@dataclass(frozen=True, slots=True, weakref_slot=True)
 class Action(ABC):
   """Minimal base Action used as a type tag for polymorphism.
 
@@ -176,16 +214,17 @@ class Action(ABC):
     """
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Take3Action(Action):
   gems: tuple[Gem, ...] = field(default_factory=tuple)
-  # optional returned gems to satisfy max-10 hand size after taking
-  ret: GemList | None = None
+  # returned gems to satisfy max-10 hand size after taking; empty if none
+  ret: GemList = GemList.EMPTY
 
   @classmethod
   def create(cls, *gems: Gem, ret_map: Mapping[Gem, int] | None = None) -> 'Take3Action':
-    ret = GemList(ret_map) if ret_map is not None else None
-    return cls(type=ActionType.TAKE_3_DIFFERENT, gems=tuple(gems), ret=ret)
+    return _intern(
+        (cls, gems, _pairs_key(ret_map)),
+        lambda: cls(type=ActionType.TAKE_3_DIFFERENT, gems=gems, ret=GemList(ret_map) if ret_map else GemList.EMPTY))
 
   def __str__(self) -> str:
     gem_str = ''.join(g.color_circle() for g in self.gems)
@@ -214,6 +253,12 @@ class Take3Action(Action):
     bank = dict(state.bank)
     player_gems = dict(player.gems)
 
+    # prepass: reject duplicates and bank shortfalls before mutating anything
+    if len(set(self.gems)) != len(self.gems):
+      raise ValueError("Take3Action gems must be distinct")
+    if any(bank.get(g, 0) < 1 for g in self.gems):
+      raise ValueError(f"Not enough gems in bank to apply {self}")
+
     # remove one of each requested gem from bank and add to player's gems
     for g in self.gems:
       bank[g] = bank.get(g, 0) - 1
@@ -225,15 +270,10 @@ class Take3Action(Action):
         player_gems[g] = player_gems.get(g, 0) - amt
         bank[g] = bank.get(g, 0) + amt
 
-    new_player = PlayerState(seat_id=player.seat_id, name=player.name,
-                             gems_in=player_gems, score=player.score,
-                             reserved_cards_in=player.reserved_cards,
-                             purchased_cards_in=player.purchased_cards)
+    new_player = replace(player, gems=GemList(player_gems))
     players = _replace_tuple(state.players, player.seat_id, new_player)
 
-    return GameState(config=state.config, players=players, bank_in=bank,
-                     visible_cards=state.visible_cards, turn=state.turn,
-                     last_action=self)
+    return _derive_state(state, players, GemList(bank), last_action=self)
 
   def _check_with_state(self, player: PlayerState, state: GameState, config: GameConfig) -> bool:
     # Ensure each gem to take is available in bank
@@ -249,8 +289,7 @@ class Take3Action(Action):
           return False
 
     # check final total does not exceed 10
-    total_after = player.gems.count() + len(self.gems) - \
-        (self.ret.count() if self.ret else 0)
+    total_after = player.gems.count() + len(self.gems) - self.ret.count()
     if total_after > config.coin_max_count_per_player:
       return False
     return True
@@ -277,22 +316,32 @@ class Take3Action(Action):
     # Enumerate legal take3 actions: either any combination of 3 distinct non-gold gems
     # with at least 1 in bank, or (if <3 available) a single action taking all remaining
     # distinct gems (permissive fallback matching previous logic).
-    bank = {g: amt for g, amt in state.bank}
-    available = [g for g, amt in bank.items() if amt > 0 and g != Gem.GOLD]
-    total = player.gems.count()
+    # bit i set when GEM_ORDER[i] is in the bank; the bank is immutable and
+    # caches its counts, so this is a few int ops with no allocation
+    counts = state.bank.counts()
+    mask = 0
+    for i in _NON_GOLD_SLOTS:
+      if counts[i] > 0:
+        mask |= 1 << i
+    num_available = mask.bit_count()
     actions: list[Take3Action] = []
-    if len(available) == 0:
+    if num_available == 0:
       return actions  # no gems available to take
 
-    from itertools import combinations
-
-    max_take = min(len(available), 3)
+    total = player.gems.count()
+    max_take = min(num_available, 3)
     if total + max_take <= config.coin_max_count_per_player:
-      # can take max_take without exceeding 10, so enumerate all combos of that size
-      combos = combinations(available, max_take)
-      for combo in combos:
-        actions.append(cls.create(*combo))
+      # can take max_take without exceeding 10, so every combo of that size
+      # is legal; there are only 31 sets of available gems, so their action
+      # lists are built once and reused
+      key = (cls, mask)
+      combos = _TAKE3_NO_RETURN.get(key)
+      if combos is None:
+        combos = tuple(cls.create(*combo) for combo in combinations(_mask_gems(mask), max_take))
+        _TAKE3_NO_RETURN[key] = combos
+      actions.extend(combos)
     else:
+      available = _mask_gems(mask)
       max_return = total + max_take - config.coin_max_count_per_player
       for return_num in range(0, max_return + 1):
         take_num = config.coin_max_count_per_player + return_num - total
@@ -311,17 +360,18 @@ class Take3Action(Action):
     return actions
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Take2Action(Action):
   gem: Gem
   count: int = 2
-  # optional returned gems to satisfy max tokens per player after taking
-  ret: GemList | None = None
+  # returned gems to satisfy max tokens per player after taking; empty if none
+  ret: GemList = GemList.EMPTY
 
   @classmethod
   def create(cls, gem: Gem, count: int = 2, ret_map: Mapping[Gem, int] | None = None) -> 'Take2Action':
-    ret = GemList(ret_map) if ret_map is not None else None
-    return cls(type=ActionType.TAKE_2_SAME, gem=gem, count=count, ret=ret)
+    return _intern(
+        (cls, gem, count, _pairs_key(ret_map)),
+        lambda: cls(type=ActionType.TAKE_2_SAME, gem=gem, count=count, ret=GemList(ret_map) if ret_map else GemList.EMPTY))
 
   def __str__(self) -> str:
     base = f"Action.Take2({self.count}{self.gem.color_circle()})"
@@ -352,8 +402,8 @@ class Take2Action(Action):
     bank = dict(state.bank)
     player_gems = dict(player.gems)
 
-    gem = getattr(self, 'gem')
-    count = getattr(self, 'count', 2)
+    gem = self.gem
+    count = self.count
     if gem == Gem.GOLD:
       raise ValueError("Cannot take two gold tokens")
     if bank.get(gem, 0) < count:
@@ -367,29 +417,24 @@ class Take2Action(Action):
         player_gems[g] = player_gems.get(g, 0) - amt
         bank[g] = bank.get(g, 0) + amt
 
-    new_player = PlayerState(seat_id=player.seat_id, name=player.name,
-                             gems_in=player_gems, score=player.score,
-                             reserved_cards_in=player.reserved_cards,
-                             purchased_cards_in=player.purchased_cards)
+    new_player = replace(player, gems=GemList(player_gems))
     players = _replace_tuple(state.players, player.seat_id, new_player)
 
-    return GameState(config=state.config, players=players, bank_in=bank,
-                     visible_cards=state.visible_cards, turn=state.turn,
-                     last_action=self)
+    return _derive_state(state, players, GemList(bank), last_action=self)
 
   def _check_with_state(self, player: PlayerState, state: GameState, config: GameConfig) -> bool:
     # stateful checks that require bank/player info
     if state.bank.get(self.gem) < config.coin_min_count_take2_in_deck:
       return False
 
-    player_gems = player.gems.to_dict()
+    player_gems = player.gems
 
     if self.ret:
       for g, amt in self.ret:
-        if player_gems.get(g, 0) < amt:
+        if player_gems.get(g) < amt:
           return False
 
-    total_after = sum(player_gems.values()) + self.count - (self.ret.count() if self.ret else 0)
+    total_after = player_gems.count() + self.count - self.ret.count()
     if total_after > config.coin_max_count_per_player:
       return False
     return True
@@ -402,7 +447,7 @@ class Take2Action(Action):
     if self.count != 2:
       return False
     # cannot return gems that are also being taken
-    if any(g == self.gem for g, _ in self.ret or ()):
+    if any(g == self.gem for g, _ in self.ret):
       return False
     return True
 
@@ -410,9 +455,8 @@ class Take2Action(Action):
   def _get_legal_actions(cls, player: PlayerState, state: GameState, config: GameConfig) -> list["Take2Action"]:
     # Any non-gold gem with >= COIN_MIN_COUNT_TAKE2_IN_DECK (typically 4) is legal to take 2 of.
     actions: list[Take2Action] = []
-    bank = {g: amt for g, amt in state.bank}
     total = player.gems.count()
-    for g, amt in bank.items():
+    for g, amt in state.bank:
       if g == Gem.GOLD:
         continue
       if amt < config.coin_min_count_take2_in_deck:
@@ -427,7 +471,6 @@ class Take2Action(Action):
       # enumerate return combinations from player's holdings excluding the gem being taken and gold
       ret_available = [[gg] * cnt for gg, cnt in player.gems if gg != g and gg != Gem.GOLD]
       ret_available = [x for sub in ret_available for x in sub]
-      from itertools import combinations
       return_combos = set(combinations(ret_available, need_return))
       for ret in return_combos:
         ret_map: Mapping[Gem, int] = {}
@@ -438,7 +481,7 @@ class Take2Action(Action):
     return actions
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class BuyCardAction(Action):
   idx: CardIdx | None
   card: Card | None
@@ -450,8 +493,12 @@ class BuyCardAction(Action):
 
   @classmethod
   def create(cls, card_idx: CardIdx | None, card: Card | None = None, payment: Mapping[Gem, int] | None = None) -> 'BuyCardAction':
-    pay = GemList(dict(payment) if payment is not None else {})
-    return cls(type=ActionType.BUY_CARD, idx=card_idx, card=card, payment=pay)
+    # cards are keyed by identity: the interned action keeps its card alive,
+    # so the id cannot be reused while the entry exists
+    return _intern(
+        (cls, card_idx, id(card), _pairs_key(payment)),
+        lambda: cls(type=ActionType.BUY_CARD, idx=card_idx, card=card,
+                    payment=GemList(dict(payment) if payment is not None else {})))
 
   def __str__(self) -> str:
     cid = self.card.id if self.card is not None else None
@@ -519,7 +566,7 @@ class BuyCardAction(Action):
     payment = self._get_payment(found)
 
     # apply payment: deduct from player_gems and add to bank
-    for g, amt in payment.items():
+    for g, amt in payment:
       if player_gems.get(g, 0) < amt:
         raise ValueError(f"Player does not have enough {g} to pay")
       player_gems[g] = player_gems.get(g, 0) - amt
@@ -527,28 +574,21 @@ class BuyCardAction(Action):
 
     # update player's purchased cards and score
     new_purchased = tuple(player.purchased_cards) + (found,)
-    new_score = player.score + getattr(found, 'points', 0)
-    # if bought from reserved, remove it from reserved_cards; otherwise keep as-is
-    if from_reserved:
-      new_reserved = tuple(reserved_list)
-    else:
-      new_reserved = tuple(player.reserved_cards)
+    new_score = player.score + found.points
+    # if bought from reserved, remove it from reserved_cards; otherwise share as-is
+    new_reserved = CardList(tuple(reserved_list)) if from_reserved else player.reserved_cards
 
-    new_player = PlayerState(seat_id=player.seat_id, name=player.name,
-                             gems_in=player_gems, score=new_score,
-                             reserved_cards_in=new_reserved,
-                             purchased_cards_in=new_purchased)
+    new_player = replace(player, gems=GemList(player_gems), score=new_score,
+                         reserved_cards=new_reserved, purchased_cards=CardList(new_purchased))
     players = _replace_tuple(state.players, player.seat_id, new_player)
 
-    return GameState(config=state.config, players=players, bank_in=bank,
-                     visible_cards_in=visible_cards, turn=state.turn,
-                     last_action=self)
+    return _derive_state(state, players, GemList(bank), CardList(visible_cards), last_action=self)
 
-  def _get_payment(self, card: Card):
-    return dict(self.payment)
+  def _get_payment(self, card: Card) -> GemList:
+    return self.payment
 
   def _check_afford(self, player: PlayerState, card: Card) -> bool:
-    return player.check_afford(card, self._get_payment(card))
+    return player.check_afford(card, self._get_payment(card).to_dict())
 
   def _check_with_state(self, player: PlayerState, state: GameState, config: GameConfig) -> bool:
     # require idx to be set and match
@@ -589,21 +629,28 @@ class BuyCardAction(Action):
   def _get_legal_actions(cls, player: PlayerState, state: GameState, config: GameConfig) -> list["BuyCardAction"]:
     # For each visible or reserved card, enumerate all exact payment dicts the player can afford.
     actions: list[BuyCardAction] = []
-    # visible cards with indices
-    for i, card in enumerate(state.visible_cards):
-      payments = player.can_afford(card)
-      for payment in payments:
-        idx = CardIdx(visible_idx=i)
+    # visible cards with indices; most of the board is out of reach, so rule
+    # cards out in one cheap pass before enumerating payments for the rest
+    visible = state.visible_cards
+    for i, ok in enumerate(player.affordable(visible)):
+      if not ok:
+        continue
+      card = visible[i]
+      idx = CardIdx(visible_idx=i)
+      for payment in player.can_afford(card):
         actions.append(cls.create(idx, card, payment=payment))
     # reserved cards with indices
-    for i, card in enumerate(player.reserved_cards):
-      payments = player.can_afford(card)
-      for payment in payments:
-        idx = CardIdx(reserve_idx=i)
+    reserved = player.reserved_cards
+    for i, ok in enumerate(player.affordable(reserved)):
+      if not ok:
+        continue
+      card = reserved[i]
+      idx = CardIdx(reserve_idx=i)
+      for payment in player.can_afford(card):
         actions.append(cls.create(idx, card, payment=payment))
     return actions
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class BuyCardActionGold(BuyCardAction):
   gold_payment: GemList = field(default_factory=GemList)
 
@@ -617,11 +664,14 @@ class BuyCardActionGold(BuyCardAction):
 
   @classmethod
   def create(cls, card_idx: CardIdx | None, card: Card | None = None, payment: Mapping[Gem, int] | None = None) -> 'BuyCardActionGold':
-    gp = GemList(dict(payment) if payment is not None else {})
-    return cls(type=ActionType.BUY_CARD, idx=card_idx, card=card, gold_payment=gp)
+    return _intern(
+        (cls, card_idx, id(card), _pairs_key(payment)),
+        lambda: cls(type=ActionType.BUY_CARD, idx=card_idx, card=card,
+                    gold_payment=GemList(dict(payment) if payment is not None else {})))
 
   def to_dict(self) -> dict:
-    d = super().to_dict()
+    # slots=True rebuilds the class, so zero-argument super() would bind the old one
+    d = super(BuyCardActionGold, self).to_dict()
     d['gold_payment'] = [(g.value, n) for g, n in self.gold_payment]
     del d['payment']
     return d
@@ -639,19 +689,19 @@ class BuyCardActionGold(BuyCardAction):
     idx = CardIdx(visible_idx=visible_idx, reserve_idx=reserve_idx, deck_head_level=deck_head_level) if idx_raw else None
     return cls.create(idx, card, payment=gold_payment)
 
-  def _get_payment(self, card: Card):
+  def _get_payment(self, card: Card) -> GemList:
     payment = {Gem.GOLD: self.gold_payment.count()}
     for g, cost in card.cost:
       count = cost - self.gold_payment.get(g)
       if count > 0:
         payment[g] = count
-    return payment
+    return GemList(payment)
 
   def normalize(self, card: Card) -> 'BuyCardAction':
     payment = self._get_payment(card)
     return BuyCardAction.create(self.idx, self.card or card, payment=payment)
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ReserveCardAction(Action):
   idx: CardIdx | None
   card: Card | None
@@ -665,7 +715,10 @@ class ReserveCardAction(Action):
 
   @classmethod
   def create(cls, card_idx: CardIdx | None, card: Card | None = None, take_gold: bool = True, ret: Gem | None = None) -> 'ReserveCardAction':
-    return cls(type=ActionType.RESERVE_CARD, idx=card_idx, card=card, take_gold=bool(take_gold), ret=ret)
+    take_gold = bool(take_gold)
+    return _intern(
+        (cls, card_idx, id(card), take_gold, ret),
+        lambda: cls(type=ActionType.RESERVE_CARD, idx=card_idx, card=card, take_gold=take_gold, ret=ret))
 
   def __str__(self) -> str:
     cid = self.card.id if self.card is not None else None
@@ -745,15 +798,10 @@ class ReserveCardAction(Action):
       player_gems[self.ret] = player_gems.get(self.ret, 0) - 1
     # create new player with reserved card added
     new_reserved = tuple(player.reserved_cards) + (found,)
-    new_player = PlayerState(seat_id=player.seat_id, name=player.name,
-                             gems_in=player_gems, score=player.score,
-                             reserved_cards_in=new_reserved,
-                             purchased_cards_in=player.purchased_cards)
+    new_player = replace(player, gems=GemList(player_gems), reserved_cards=CardList(new_reserved))
     players = _replace_tuple(state.players, player.seat_id, new_player)
 
-    return GameState(config=state.config, players=players, bank_in=bank,
-                     visible_cards_in=visible_cards, turn=state.turn,
-                     last_action=self)
+    return _derive_state(state, players, GemList(bank), CardList(visible_cards), last_action=self)
 
   def _check_with_state(self, player: PlayerState, state: GameState, config: GameConfig) -> bool:
     if not player.can_reserve(config):
@@ -828,13 +876,14 @@ class ReserveCardAction(Action):
     return actions
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class NoopAction(Action):
   """A no-op/fallback action that advances the turn without mutating state."""
 
   @classmethod
   def create(cls) -> 'NoopAction':
-    return cls(type=ActionType.NOOP)
+    # a noop carries no fields, so every caller shares one instance
+    return _NOOP
 
   def __str__(self) -> str:  # pragma: no cover - trivial
     return "Action.Noop()"
@@ -848,9 +897,7 @@ class NoopAction(Action):
 
   def _apply(self, player: PlayerState, state: GameState, config: GameConfig) -> GameState:
     # simply return a new GameState with last_action set (do not modify turn)
-    return GameState(config=state.config, players=state.players, bank=state.bank,
-                     visible_cards=state.visible_cards, turn=state.turn,
-                     last_action=self)
+    return _derive_state(state, last_action=self)
 
   def _check_with_state(self, player: PlayerState, state: GameState, config: GameConfig) -> bool:
     return True
@@ -862,3 +909,6 @@ class NoopAction(Action):
   def _get_legal_actions(cls, player: PlayerState, state: GameState, config: GameConfig) -> list["NoopAction"]:
     # Always legal; only used as fallback if no other actions exist.
     return [cls.create()]
+
+
+_NOOP = NoopAction(type=ActionType.NOOP)
@@ -3,8 +3,7 @@
 Follows the contract described in AGENTS.md. Keep this file minimal.
 All Python code in this repo uses 2-space indentation.
 """
-from dataclasses import asdict, dataclass
-from pydantic import BaseModel, ConfigDict, Field, field_validator
+from dataclasses import asdict, dataclass, field
 import random
 from collections.abc import Sequence
 from typing import Any, ClassVar, TypeVar
@@ -13,7 +12,7 @@ from ..state import PlayerState, GameState
 from ..actions import Action
 
 AGENT_METADATA_HISTORY_ROUND = "history_round"
-def AGENT_SEED_GENERATOR(): return random.Random().randint(0, 2**31 - 1)
+def AGENT_SEED_GENERATOR(): return random.randrange(1 << 31)
 
 
 @dataclass
@@ -30,19 +29,31 @@ class Agent:
     if seed is None:
       seed = AGENT_SEED_GENERATOR()
     self._seed = seed
-    self.rng = random.Random(seed)
+    # created lazily by `rng`; deterministic agents never pay for it
+    self._rng: random.Random | None = None
+    self._base_metadata = self._make_base_metadata()
 
   @classmethod
   def __init_subclass__(cls):
     # 将子类添加到注册表
-    cls.agent_name_to_cls[cls.__name__] = cls
+    cls.agent_name_to_cls[cls.__qualname__] = cls
     super().__init_subclass__()
 
+  @property
+  def rng(self) -> random.Random:
+    """Local RNG seeded from `_seed`, constructed on first access."""
+    if self._rng is None:
+      self._rng = random.Random(self._seed)
+    return self._rng
+
   def reset(self, seed: int | None = None) -> None:
     if seed is None:
       seed = AGENT_SEED_GENERATOR()
     self._seed = seed
-    self.rng.seed(seed)
+    if self._rng is not None:
+      self._rng.seed(seed)
+    # rebuild rather than mutate: metadata returned for earlier games keeps its seed
+    self._base_metadata = self._make_base_metadata()
     self._reset()
 
   def _reset(self) -> None:
@@ -72,17 +83,20 @@ class Agent:
   def metadata(self) -> dict:
     """Return optional metadata about the agent's internal state.
 
-    This is recorded during simulations for later analysis.
+    This is recorded during simulations for later analysis. When
+    `_metadata()` adds nothing the cached base dict is returned as-is, so
+    callers must not mutate the result.
     """
+    if (extra := self._metadata()):
+      return {**self._base_metadata, **extra}
+    return self._base_metadata
 
-    metadata = {
-        "type": self.__class__.__name__,
+  def _make_base_metadata(self) -> dict:
+    return {
+        "type": type(self).__qualname__,
         "seat_id": self.seat_id,
         "seed": self._seed,
     }
-    if (extra := self._metadata()):
-      metadata.update(extra)
-    return metadata
 
   def _metadata(self) -> dict:
     """
@@ -97,7 +111,7 @@ class Agent:
     evaluation = getattr(self, "evaluation", None)
 
     return AgentBuilder(
-        cls_name=self.__class__.__name__,
+        cls_name=type(self).__qualname__,
         seat_id=self.seat_id,
         name=self.name,
         kwargs={"evaluation": evaluation} if evaluation is not None else None,
@@ -118,17 +132,30 @@ class Agent:
 BaseAgent = TypeVar('BaseAgent', bound=Agent)
 
 
-class AgentBuilder(BaseModel):
+@dataclass(slots=True)
+class AgentBuilder:
   """Simple factory for constructing agents used in simulations.
+
+  A plain dataclass: fields are checked once in `__post_init__` instead of
+  going through pydantic validation. Pydantic models embedding it (e.g.
+  `SimulationSummary`) still serialize it; the `exclude` entry in the
+  `kwargs` field metadata keeps the live objects out of their dumps.
   """
 
   cls_name: str
   seat_id: int
   name: str
-  kwargs: dict | None = Field(default=None, exclude=True)
+  kwargs: dict | None = field(default=None, repr=False, compare=False, metadata={"exclude": True})
   # evaluation=GreedyAgentEvaluationV1()
-  config: dict = {}  # gem_score=1.0, ...
-
+  config: dict = field(default_factory=dict)  # gem_score=1.0, ...
+
+  def __post_init__(self) -> None:
+    if not isinstance(self.cls_name, str) or not self.cls_name:
+      raise ValueError("AgentBuilder.cls_name must be a non-empty string")
+    if not isinstance(self.seat_id, int) or self.seat_id < 0:
+      raise ValueError("AgentBuilder.seat_id must be a non-negative int")
+    if not isinstance(self.name, str):
+      raise ValueError("AgentBuilder.name must be a string")
 
   def build(self) -> Agent:
     """Instantiate the configured agent.
@@ -3,19 +3,21 @@
 GreedyAgent uses quick_score to evaluate legal actions and picks the best.
 """
 
-from collections.abc import Sequence
-from typing import TypeVar, Generic
+from collections import OrderedDict
+from collections.abc import Callable, Sequence
+from typing import Any, TypeVar, Generic, cast
 from abc import ABC, abstractmethod
-from dataclasses import asdict
-from pydantic.dataclasses import dataclass as pydantic_dataclass
+from dataclasses import asdict, dataclass
+import math
+import numpy as np
 
-from gems.typings import Gem
+from gems.typings import ActionType, Gem
 from .core import Agent
-from ..actions import Action, NoopAction, Take3Action, Take2Action, BuyCardAction, ReserveCardAction
+from ..actions import Action, Take3Action, Take2Action, BuyCardAction, ReserveCardAction
 from ..state import GameState
 
 
-@pydantic_dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class BaseConfig():
   pass
 
@@ -23,7 +25,7 @@ class BaseConfig():
 C = TypeVar("C", bound=BaseConfig)
 
 
-@pydantic_dataclass(frozen=True)
+@dataclass(frozen=True)
 class BaseEvaluation(ABC, Generic[C]):
   config: C
 
@@ -31,8 +33,16 @@ class BaseEvaluation(ABC, Generic[C]):
   def quick_score(self, state: GameState, seat_id: int, action: Action) -> float:
     pass
 
+  def score_actions(self, state: GameState, seat_id: int, actions: Sequence[Action]) -> np.ndarray:
+    """Return a float array with the `quick_score` of each action.
 
-@pydantic_dataclass(frozen=True)
+    Subclasses may override this with a vectorized kernel; the default
+    simply calls `quick_score` once per action.
+    """
+    return np.fromiter((self.quick_score(state, seat_id, a) for a in actions), dtype=float, count=len(actions))
+
+
+@dataclass(frozen=True, slots=True)
 class GreedyAgentEvaluationV1Config(BaseConfig):
   # 每个宝石的基础分数
   gem_score: float = 10.0
@@ -50,76 +60,271 @@ class GreedyAgentEvaluationV1Config(BaseConfig):
   gem_cost_score: float = 2.0
 
 
-@pydantic_dataclass(frozen=True)
+def _score_take3(cfg: GreedyAgentEvaluationV1Config, action: Take3Action) -> float:
+  return (len(action.gems) - action.ret.count()) * cfg.gem_score
+
+
+def _score_take2(cfg: GreedyAgentEvaluationV1Config, action: Take2Action) -> float:
+  return (action.count - action.ret.count()) * cfg.gem_score
+
+
+def _score_buy(cfg: GreedyAgentEvaluationV1Config, action: BuyCardAction) -> float:
+  card = action.card
+  assert card is not None
+  pay = action.payment
+  score = (card.points + cfg.extra_point_per_card) * cfg.point_score + \
+      (cfg.bonus_score if card.bonus is not None else 0)
+  gold = pay.get(Gem.GOLD)
+  payment_cost = gold * cfg.gold_cost_score + (pay.count() - gold) * cfg.gem_cost_score
+  return score - payment_cost
+
+
+def _score_reserve(cfg: GreedyAgentEvaluationV1Config, action: ReserveCardAction) -> float:
+  score = 0
+  if action.take_gold:
+    score += cfg.gold_score
+  if action.ret:
+    score -= cfg.gem_score
+  return score
+
+
+def _score_noop(cfg: GreedyAgentEvaluationV1Config, action: Action) -> float:
+  return -100.0
+
+
+# transposition-table entry kinds: the stored value is exact, or only a
+# lower/upper bound because the search that produced it was cut off
+_TT_EXACT = 0
+_TT_LOWER = 1
+_TT_UPPER = 2
+
+# batches shorter than this are cheaper to score with the scalar scorers
+_VECTORIZE_MIN_ACTIONS = 16
+
+# one scorer per ActionType, looked up on action.type
+_SCORERS: dict[ActionType, Callable[[GreedyAgentEvaluationV1Config, Any], float]] = {
+    ActionType.TAKE_3_DIFFERENT: _score_take3,
+    ActionType.TAKE_2_SAME: _score_take2,
+    ActionType.BUY_CARD: _score_buy,
+    ActionType.RESERVE_CARD: _score_reserve,
+    ActionType.NOOP: _score_noop,
+}
+
+
+@dataclass(frozen=True)
 class GreedyAgentEvaluationV1(BaseEvaluation[GreedyAgentEvaluationV1Config]):
   config: GreedyAgentEvaluationV1Config = GreedyAgentEvaluationV1Config()
 
   def quick_score(self, state: GameState, seat_id: int, action: Action) -> float:
     """Quick, cheap heuristic for GreedyAgent.
 
-    This is intentionally minimal: it returns 0.0 for unknown actions. A
-    repository-specific heuristic can replace or extend this function.
+    This is intentionally minimal: one small formula per action type in
+    `_SCORERS`. A repository-specific heuristic can replace or extend this
+    function.
     """
     # TODO: implement a domain-specific heuristic using engine accessors
-    player = state.players[seat_id]
-
-    if isinstance(action, Take3Action):
-      get_num = len(action.gems)
-      drop_num = action.ret.count() if action.ret else 0
-      return (get_num - drop_num) * self.config.gem_score
-    elif isinstance(action, Take2Action):
-      get_num = action.count
-      drop_num = action.ret.count() if action.ret else 0
-      return (get_num - drop_num) * self.config.gem_score
-    elif isinstance(action, BuyCardAction):
-      card = action.card
-      assert card is not None
-      score = (card.points + self.config.extra_point_per_card) * self.config.point_score + \
-          (self.config.bonus_score if card.bonus is not None else 0)
-      payment_cost = action.payment.get(Gem.GOLD) * self.config.gold_cost_score + \
-          sum(action.payment.get(g) for g in Gem if g != Gem.GOLD) * self.config.gem_cost_score
-      return float(score) - float(payment_cost)
-    elif isinstance(action, ReserveCardAction):
-      score = 0
-      if action.take_gold:
-        score += self.config.gold_score
-      if action.ret:
-        score -= self.config.gem_score
-      return score
-    elif isinstance(action, NoopAction):
-      return -100.0
-    return 0.0
+    return _SCORERS[action.type](self.config, action)
+
+  def score_actions(self, state: GameState, seat_id: int, actions: Sequence[Action]) -> np.ndarray:
+    """Vectorized `quick_score` over a whole legal-action list.
+
+    Actions are bucketed by `action.type` in a single pass that only
+    gathers the integers each formula needs; the arithmetic then runs as a
+    few NumPy ops per bucket. The formulas match `quick_score` term for
+    term so ties resolve exactly as they would one action at a time.
+
+    Below `_VECTORIZE_MIN_ACTIONS` the fixed per-call cost of the NumPy ops
+    outweighs the per-action savings, so short lists are scored one by one.
+    """
+    if len(actions) < _VECTORIZE_MIN_ACTIONS:
+      return super().score_actions(state, seat_id, actions)
+    cfg = self.config
+    scores = np.zeros(len(actions), dtype=float)
+    gem_idx: list[int] = []
+    gem_net: list[int] = []
+    buy_idx: list[int] = []
+    buy_points: list[int] = []
+    buy_bonus: list[bool] = []
+    buy_gold: list[int] = []
+    buy_gems: list[int] = []
+    for i, action in enumerate(actions):
+      t = action.type
+      # action.type pins the concrete class, so skip the isinstance chain
+      if t is ActionType.TAKE_3_DIFFERENT:
+        take3 = cast(Take3Action, action)
+        gem_idx.append(i)
+        gem_net.append(len(take3.gems) - take3.ret.count())
+      elif t is ActionType.TAKE_2_SAME:
+        take2 = cast(Take2Action, action)
+        gem_idx.append(i)
+        gem_net.append(take2.count - take2.ret.count())
+      elif t is ActionType.BUY_CARD:
+        buy = cast(BuyCardAction, action)
+        card = buy.card
+        assert card is not None
+        payment = buy.payment
+        buy_idx.append(i)
+        buy_points.append(card.points)
+        buy_bonus.append(card.bonus is not None)
+        gold = payment.get(Gem.GOLD)
+        buy_gold.append(gold)
+        buy_gems.append(payment.count() - gold)
+      elif t is ActionType.NOOP:
+        scores[i] = -100.0
+      else:
+        scores[i] = self.quick_score(state, seat_id, action)
+
+    if gem_idx:
+      scores[gem_idx] = np.array(gem_net, dtype=float) * cfg.gem_score
+    if buy_idx:
+      score = (np.array(buy_points, dtype=float) + cfg.extra_point_per_card) * cfg.point_score + \
+          np.where(buy_bonus, cfg.bonus_score, 0.0)
+      payment_cost = np.array(buy_gold, dtype=float) * cfg.gold_cost_score + \
+          np.array(buy_gems, dtype=float) * cfg.gem_cost_score
+      scores[buy_idx] = score - payment_cost
+    return scores
 
 
 class GreedyAgent(Agent):
+  """Agent picking the action with the best `quick_score`.
+
+  With `depth > 1` the agent looks ahead: each action is worth its own
+  score minus the best score the next mover can reach from the resulting
+  state (plus, when the next mover is this agent again), searched to
+  `depth` plies with negamax and alpha-beta pruning. The search never
+  sees hidden decks, so visible cards bought or reserved during lookahead
+  are not refilled. `depth=1` is the plain greedy choice.
+  """
   evaluation: BaseEvaluation
+  depth: int = 1
 
-  def __init__(self, seat_id: int, *, seed: int | None = None, evaluation: BaseEvaluation = GreedyAgentEvaluationV1(), name: str | None = None, debug: bool = False):
+  def __init__(self, seat_id: int, *, seed: int | None = None, evaluation: BaseEvaluation = GreedyAgentEvaluationV1(), name: str | None = None, debug: bool = False, depth: int = 1,
+               tt_size: int = 1 << 16):
     super().__init__(seat_id, seed=seed, name=name)
+    if depth < 1:
+      raise ValueError("depth must be >= 1")
     self.evaluation = evaluation
+    self.depth = depth
+    # evaluation configs are frozen, so their metadata is built once
+    self._eval_metadata = {
+        "evaluation": evaluation.__class__.__name__,
+        "evaluation_config": asdict(evaluation.config),
+    }
+    # LRU of (GameState.position_key(), depth) -> (value, _TT_* kind) for the
+    # lookahead, bounded so an agent reused across games stays small
+    self.tt_size = tt_size
+    self._tt: OrderedDict[tuple, tuple[float, int]] = OrderedDict()
 
   def act(self, state: GameState, legal_actions: Sequence[Action], *, timeout: float | None = None) -> Action:
     if not legal_actions:
       raise ValueError("No legal actions available")
 
-    action_score = [
-        (a, self.evaluation.quick_score(state, self.seat_id, a)) for a in legal_actions
-    ]
-    best_score = max(score for _, score in action_score)
-    best_actions = [a for a, score in action_score if score == best_score]
+    if self.depth > 1:
+      return self._search_root(state, legal_actions)
 
-    best = self.rng.choice(best_actions)
+    scores = self.evaluation.score_actions(state, self.seat_id, legal_actions).tolist()
+    # reservoir-sample among tied best scores: the k-th tie replaces the
+    # current pick with probability 1/k, so no tie list is ever built
+    best: Action | None = None
+    best_score = -math.inf
+    ties = 0
+    for a, score in zip(legal_actions, scores):
+      if score > best_score:
+        best_score = score
+        best = a
+        ties = 1
+      elif score == best_score:
+        ties += 1
+        if self.rng.random() * ties < 1:
+          best = a
 
     # At this point `best` is guaranteed to be set because `legal_actions`
     # is non-empty, but help the type-checker by asserting not None.
     assert best is not None
     return best
 
+  def _search_root(self, state: GameState, legal_actions: Sequence[Action]) -> Action:
+    scores = self.evaluation.score_actions(state, self.seat_id, legal_actions).tolist()
+    # move ordering: best quick_score first so the cut-offs come early;
+    # shuffling before the stable sort breaks ties between equal values
+    order = list(range(len(legal_actions)))
+    self.rng.shuffle(order)
+    order.sort(key=lambda i: scores[i], reverse=True)
+
+    best = legal_actions[order[0]]
+    alpha = -math.inf
+    for i in order:
+      a = legal_actions[i]
+      value = self._action_value(state, self.seat_id, a, scores[i], self.depth, alpha, math.inf)
+      if value > alpha:
+        alpha = value
+        best = a
+    return best
+
+  def _action_value(self, state: GameState, seat_id: int, action: Action, score: float,
+                    depth: int, alpha: float, beta: float) -> float:
+    """Value of `action` for `seat_id`: its score combined with the value of
+    the child state, searched within the (alpha, beta) window."""
+    # actions come from get_legal_actions, so skip apply()'s legality check
+    child = action._apply(state.players[seat_id], state, state.config).advance_turn()
+    child_seat = child.turn % len(child.players)
+    if child_seat == seat_id:
+      return score + self._negamax(child, depth - 1, alpha - score, beta - score)
+    return score - self._negamax(child, depth - 1, score - beta, score - alpha)
+
+  def _negamax(self, state: GameState, depth: int, alpha: float, beta: float) -> float:
+    """Best value the player to move in `state` can reach in `depth` plies.
+
+    Values are cached per position and depth in an LRU of `tt_size`
+    entries, since the same position is often reached by several move
+    orders and again from the next turn's search.
+    """
+    tt = self._tt
+    key = (state.position_key(), depth)
+    entry = tt.get(key)
+    if entry is not None:
+      tt.move_to_end(key)
+      value, kind = entry
+      if kind == _TT_EXACT or (kind == _TT_LOWER and value >= beta) or (kind == _TT_UPPER and value <= alpha):
+        return value
+
+    seat_id = state.turn % len(state.players)
+    actions = state.players[seat_id].get_legal_actions(state)
+    scores = self.evaluation.score_actions(state, seat_id, actions).tolist()
+    if depth <= 1:
+      best = max(scores)
+      self._tt_store(key, best, _TT_EXACT)
+      return best
+    alpha_in = alpha
+    best = -math.inf
+    for i in sorted(range(len(actions)), key=scores.__getitem__, reverse=True):
+      value = self._action_value(state, seat_id, actions[i], scores[i], depth, alpha, beta)
+      if value > best:
+        best = value
+        if value > alpha:
+          alpha = value
+          if alpha >= beta:
+            break
+    if best <= alpha_in:
+      self._tt_store(key, best, _TT_UPPER)
+    elif best >= beta:
+      self._tt_store(key, best, _TT_LOWER)
+    else:
+      self._tt_store(key, best, _TT_EXACT)
+    return best
+
+  def _tt_store(self, key: tuple, value: float, kind: int) -> None:
+    tt = self._tt
+    tt[key] = (value, kind)
+    tt.move_to_end(key)
+    if len(tt) > self.tt_size:
+      tt.popitem(last=False)
+
   def _metadata(self) -> dict:
-    return {
-        "evaluation": self.evaluation.__class__.__name__,
-        "evaluation_config": asdict(self.evaluation.config),
-    }
+    return self._eval_metadata
+
+  def _reset(self) -> None:
+    self._tt.clear()
 
 
 __all__ = ["GreedyAgent", "GreedyAgentEvaluationV1Config", "GreedyAgentEvaluationV1"]
@@ -5,12 +5,11 @@ This is useful for testing gym-based policies or for simple stochastic
 agents that operate in the structured ActionSpace representation.
 """
 from collections.abc import Sequence
-from typing import cast
 
 
 from ..state import GameState
 from ..actions import Action, BuyCardActionGold
-from ..gym.action_space import ActionDict, ActionSpace
+from ..gym.action_space import ActionSpace
 from ..typings import ActionType
 
 from .core import Agent
@@ -19,22 +18,23 @@ from .core import Agent
 class SpaceSampleAgent(Agent):
   """Agent which samples from a provided ActionSpace and decodes samples
   into engine Actions. It will attempt up to `max_samples` samples and
-  return the first one that appears in `legal_actions`. If no sampled
-  action matches, it falls back to uniform random choice from
-  `legal_actions` using the agent's RNG.
+  return the first legal one, preferring a legal buy. If no sampled
+  action is legal, it returns a noop.
 
   Contract:
   - __init__(seat_id, action_space: ActionSpace, seed: int | None = None,
-    max_samples: int = 16)
+    max_samples: int = 16, debug: bool = False)
   - act(state, legal_actions, *, timeout=None) -> Action
   """
+  debug: bool = False
 
-  def __init__(self, seat_id: int, *, action_space: ActionSpace, seed: int | None = None, name: str | None = None, max_samples: int = 100):
+  def __init__(self, seat_id: int, *, action_space: ActionSpace, seed: int | None = None, name: str | None = None, max_samples: int = 100, debug: bool = False):
     super().__init__(seat_id, seed=seed, name=name)
     if action_space is None:
       raise ValueError("action_space is required")
     self.action_space = action_space
     self.max_samples = int(max_samples)
+    self.debug = debug
 
   def _reset(self) -> None:
     # Re-seed the ActionSpace RNG where supported to keep sampling
@@ -50,49 +50,41 @@ class SpaceSampleAgent(Agent):
     if not legal_actions:
       raise ValueError("No legal actions available")
 
-    state.print_summary()
-    legal = set(legal_actions)
-
-    # Try sampling from the structured ActionSpace and decode to Action.
-    # Return the first sample that equals one of the provided legal actions.
-    actions: list[Action] = []
-    for i in range(self.max_samples):
-      try:
-        sample = cast(ActionDict, self.action_space.sample())
-        # if actions is not None:
-        #   sample['type'][...] = 2  # BUY_CARD
-        action = self.action_space.decode(sample)
-        if isinstance(action, BuyCardActionGold):
-          assert action.idx is not None
-          card = state.get_card(action.idx, seat_id=self.seat_id)
-          action = action.normalize(card)
-      except Exception as e:
-        print(e)
-        # Sampling/decoding may fail for invalid intermediate samples; try again.
+    if self.debug:
+      state.print_summary()
+
+    # Draw the whole batch of samples up front and decode them in order.
+    # The first legal BUY_CARD wins outright; otherwise the first legal
+    # non-noop sample is returned.
+    first: Action | None = None
+    for sample in self.action_space.sample_batch(self.max_samples):
+      # Invalid samples are skipped up front rather than by catching the
+      # IndexError/ValueError decoding or card lookup would raise.
+      if not self.action_space.validate(sample, state, self.seat_id):
         continue
-
-      # print(f"Sampled action: [{i}] {action}")
-      # if action not in legal:
-      #   continue
+      action = self.action_space.decode(sample)
+      if isinstance(action, BuyCardActionGold):
+        assert action.idx is not None
+        card = state.get_card(action.idx, seat_id=self.seat_id)
+        action = action.normalize(card)
 
       if action.type == ActionType.NOOP:
         continue
 
       if not action.check(state):
-        if action.type == ActionType.BUY_CARD:
+        if self.debug and action.type == ActionType.BUY_CARD:
           print(f"Sampled action failed legality check: {action}")
         continue
 
-      actions.append(action)
-
-    for action in actions:
       if action.type == ActionType.BUY_CARD:
         return action
+      if first is None:
+        first = action
 
-    for action in actions:
-      return action
+    if first is not None:
+      return first
 
-    # Fallback: pick uniformly among legal actions using agent RNG.
+    # Fallback: no sample was legal, so pass the turn.
     return Action.noop()
 
 
@@ -1,16 +1,18 @@
-from collections.abc import Sequence
-from typing import TypeVar, Generic
+from collections import OrderedDict
+from collections.abc import Callable, Sequence
+from typing import Any, TypeVar, Generic
 from abc import ABC, abstractmethod
-from dataclasses import asdict
-from pydantic.dataclasses import dataclass as pydantic_dataclass
+from dataclasses import asdict, dataclass
+import math
+import numpy as np
 
-from gems.typings import Card, Gem, GemList
+from gems.typings import ActionType, Card, Gem, GemList
 from .core import AGENT_METADATA_HISTORY_ROUND, Agent
-from ..actions import Action, NoopAction, Take3Action, Take2Action, BuyCardAction, ReserveCardAction
+from ..actions import Action, Take3Action, Take2Action, BuyCardAction, ReserveCardAction
 from ..state import GameState
 
 
-@pydantic_dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class BaseConfig():
   pass
 
@@ -18,7 +20,7 @@ class BaseConfig():
 C = TypeVar("C", bound=BaseConfig)
 
 
-@pydantic_dataclass(frozen=True)
+@dataclass(frozen=True)
 class BaseEvaluation(ABC, Generic[C]):
   config: C
 
@@ -26,8 +28,12 @@ class BaseEvaluation(ABC, Generic[C]):
   def quick_score(self, state: GameState, seat_id: int, target_card: Card | None, action: Action) -> float:
     pass
 
+  def score_actions(self, state: GameState, seat_id: int, target_card: Card | None, actions: Sequence[Action]) -> np.ndarray:
+    """Return a float array with the `quick_score` of each action."""
+    return np.fromiter((self.quick_score(state, seat_id, target_card, a) for a in actions), dtype=float, count=len(actions))
 
-@pydantic_dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class TargetAgentEvaluationV1Config(BaseConfig):
   # 每个宝石的基础分数
   gem_score: float = 10.0
@@ -45,72 +51,144 @@ class TargetAgentEvaluationV1Config(BaseConfig):
   gem_cost_score: float = 2.0
 
 
-@pydantic_dataclass(frozen=True)
+@dataclass(frozen=True)
 class TargetAgentEvaluationV1(BaseEvaluation[TargetAgentEvaluationV1Config]):
   config: TargetAgentEvaluationV1Config = TargetAgentEvaluationV1Config()
 
-  def _gem_extra_score(self, player_gems: GemList, cost: GemList, gems: Sequence[Gem]) -> float:
-    score = 0.0
-    total_cost_num = cost.count()
+  def _gem_weights(self, player_gems: GemList, cost: GemList) -> dict[Gem, float]:
+    """Return the extra score each gem is worth towards `cost`.
+
+    Computed for all gem colors at once from the count arrays; only gems
+    the player is short of appear in the result.
+    """
+    c = cost.as_array()
+    total_cost_num = int(c.sum())
+    if total_cost_num == 0:
+      return {}
     # 如果目标卡牌需求的宝石，玩家当前不满足，则提高分数
     # 缺的越多分数越高 （因为更需要这些宝石）
     # 缺的宝石总需求量越高分数越高
-    for g in gems:
-      if (g_cost := cost.get(g)) > 0 and (g_have := player_gems.get(g)) < g_cost:
-        score += (g_cost - g_have) * g_cost / total_cost_num * 5
-    return score
+    weights = np.maximum(c - player_gems.as_array(), 0) * c / total_cost_num * 5
+    return {g: w for g, w in zip(GemList.GEM_ORDER, weights.tolist()) if w > 0}
 
   def quick_score(self, state: GameState, seat_id: int, target_card: Card | None, action: Action) -> float:
-    player = state.players[seat_id]
-    cost = target_card.cost if target_card is not None else GemList()
-
-    if isinstance(action, Take3Action):
-      get_num = len(action.gems)
-      drop_num = action.ret.count() if action.ret else 0
-      score = (get_num - drop_num) * self.config.gem_score
-      score += self._gem_extra_score(player.gems, cost, action.gems)
-      if action.ret:
-        score -= self._gem_extra_score(player.gems, cost, action.ret.flatten())
-      return score
-    elif isinstance(action, Take2Action):
-      get_num = action.count
-      drop_num = action.ret.count() if action.ret else 0
-      score = (get_num - drop_num) * self.config.gem_score
-      score += self._gem_extra_score(player.gems, cost, [action.gem] * get_num)
-      if action.ret:
-        score -= self._gem_extra_score(player.gems, cost, action.ret.flatten())
-      return score
-    elif isinstance(action, BuyCardAction):
-      card = action.card
-      assert card is not None
-      score = (card.points + self.config.extra_point_per_card) * \
-          self.config.point_score + (self.config.bonus_score if card.bonus is not None else 0)
-      payment_cost = action.payment.get(Gem.GOLD) * self.config.gold_cost_score + \
-          sum(action.payment.get(g) for g in Gem if g != Gem.GOLD) * self.config.gem_cost_score
-      return float(score) - float(payment_cost)
-    elif isinstance(action, ReserveCardAction):
-      score = 0
-      if action.take_gold:
-        score += self.config.gold_score
-      if action.ret:
-        score -= self.config.gem_score
-        score -= self._gem_extra_score(player.gems, cost, [action.ret])
-      return score
-    elif isinstance(action, NoopAction):
+    if action.type is ActionType.NOOP:
       return -100.0
+    cost = target_card.cost if target_card is not None else GemList.EMPTY
+    return _SCORERS[action.type](self, self._gem_weights(state.players[seat_id].gems, cost), action)
+
+  def score_actions(self, state: GameState, seat_id: int, target_card: Card | None, actions: Sequence[Action]) -> np.ndarray:
+    """Score a whole legal-action list into a pre-sized array.
+
+    The per-gem extra weights towards the target cost are computed once
+    for the batch instead of once per action.
+    """
+    cost = target_card.cost if target_card is not None else GemList.EMPTY
+    weights = self._gem_weights(state.players[seat_id].gems, cost)
+    scores = np.empty(len(actions), dtype=float)
+    for i, action in enumerate(actions):
+      scores[i] = _SCORERS[action.type](self, weights, action)
+    return scores
+
+
+def _gem_extra_score(weights: dict[Gem, float], gems: Sequence[Gem]) -> float:
+  # no target, or the player already holds its cost: nothing to look up
+  if not weights:
+    return 0.0
+  score = 0.0
+  for g in gems:
+    if g in weights:
+      score += weights[g]
+  return score
+
+
+def _gem_extra_score_counts(weights: dict[Gem, float], gems: GemList) -> float:
+  """`_gem_extra_score` over a GemList's counts, without flattening it."""
+  if not weights:
     return 0.0
+  score = 0.0
+  for g, n in gems:
+    if g in weights:
+      score += weights[g] * n
+  return score
+
+
+def _score_take3(ev: TargetAgentEvaluationV1, weights: dict[Gem, float], action: Take3Action) -> float:
+  ret = action.ret
+  score = (len(action.gems) - ret.count()) * ev.config.gem_score
+  score += _gem_extra_score(weights, action.gems)
+  score -= _gem_extra_score_counts(weights, ret)
+  return score
+
+
+def _score_take2(ev: TargetAgentEvaluationV1, weights: dict[Gem, float], action: Take2Action) -> float:
+  ret = action.ret
+  get_num = action.count
+  score = (get_num - ret.count()) * ev.config.gem_score
+  score += weights.get(action.gem, 0.0) * get_num
+  score -= _gem_extra_score_counts(weights, ret)
+  return score
+
+
+def _score_buy(ev: TargetAgentEvaluationV1, weights: dict[Gem, float], action: BuyCardAction) -> float:
+  cfg = ev.config
+  card = action.card
+  assert card is not None
+  pay = action.payment
+  score = (card.points + cfg.extra_point_per_card) * cfg.point_score + \
+      (cfg.bonus_score if card.bonus is not None else 0)
+  gold = pay.get(Gem.GOLD)
+  payment_cost = gold * cfg.gold_cost_score + (pay.count() - gold) * cfg.gem_cost_score
+  return score - payment_cost
+
+
+def _score_reserve(ev: TargetAgentEvaluationV1, weights: dict[Gem, float], action: ReserveCardAction) -> float:
+  cfg = ev.config
+  score = 0
+  if action.take_gold:
+    score += cfg.gold_score
+  if action.ret:
+    score -= cfg.gem_score
+    score -= _gem_extra_score(weights, [action.ret])
+  return score
+
+
+def _score_noop(ev: TargetAgentEvaluationV1, weights: dict[Gem, float], action: Action) -> float:
+  return -100.0
+
+
+# one scorer per ActionType, looked up on action.type
+_SCORERS: dict[ActionType, Callable[[TargetAgentEvaluationV1, dict[Gem, float], Any], float]] = {
+    ActionType.TAKE_3_DIFFERENT: _score_take3,
+    ActionType.TAKE_2_SAME: _score_take2,
+    ActionType.BUY_CARD: _score_buy,
+    ActionType.RESERVE_CARD: _score_reserve,
+    ActionType.NOOP: _score_noop,
+}
 
 
 class TargetAgent(Agent):
   evaluation: BaseEvaluation
   target_card: Card | None = None
-  card_history: list[Card | None] = []
+  card_history: list[Card | None]
   debug: bool = False
 
-  def __init__(self, seat_id: int, *, seed: int | None = None, evaluation: BaseEvaluation = TargetAgentEvaluationV1(), name: str | None = None,debug: bool = False):
+  def __init__(self, seat_id: int, *, seed: int | None = None, evaluation: BaseEvaluation = TargetAgentEvaluationV1(), name: str | None = None,debug: bool = False,
+               score_cache_size: int = 0):
     super().__init__(seat_id, seed=seed, name=name)
     self.evaluation = evaluation
     self.debug = debug
+    self.card_history = []
+    # opt-in LRU of action scores keyed by position, for rollouts that keep
+    # revisiting the same positions; off by default since ordinary play
+    # never sees a position twice
+    self.score_cache_size = score_cache_size
+    self._score_cache: OrderedDict[tuple, list[float]] = OrderedDict()
+    # evaluation configs are frozen, so their metadata is built once
+    self._eval_metadata = {
+        "evaluation": evaluation.__class__.__name__,
+        "evaluation_config": asdict(evaluation.config),
+    }
 
   def act(self, state: GameState, legal_actions: Sequence[Action], *, timeout: float | None = None) -> Action:
 
@@ -119,13 +197,22 @@ class TargetAgent(Agent):
     self.update(state)
     self.card_history.append(self.target_card)
 
-    action_score = [
-        (a, self.evaluation.quick_score(state, self.seat_id, self.target_card, a)) for a in legal_actions
-    ]
-    best_score = max(score for _, score in action_score)
-    best_actions = [a for a, score in action_score if score == best_score]
+    scores = self._score(state, legal_actions)
+    # reservoir-sample among tied best scores: the k-th tie replaces the
+    # current pick with probability 1/k, so no tie list is ever built
+    best: Action | None = None
+    best_score = -math.inf
+    ties = 0
+    for a, score in zip(legal_actions, scores):
+      if score > best_score:
+        best_score = score
+        best = a
+        ties = 1
+      elif score == best_score:
+        ties += 1
+        if self.rng.random() * ties < 1:
+          best = a
 
-    best = self.rng.choice(best_actions)
     # At this point `best` is guaranteed to be set because `legal_actions`
     # is non-empty, but help the type-checker by asserting not None.
     assert best is not None
@@ -133,11 +220,33 @@ class TargetAgent(Agent):
     if self.debug:
       print(f"[TargetAgent] seat_id={self.seat_id} target_card={self.target_card}")
       print("  Legal actions and scores:")
-      action_score.sort(key=lambda x: x[1], reverse=True)
+      action_score = sorted(zip(legal_actions, scores), key=lambda x: x[1], reverse=True)
       for a, score in action_score:
         print(f"    Action: {a}, Score: {score}")
     return best
 
+  def _score(self, state: GameState, legal_actions: Sequence[Action]) -> list[float]:
+    """Score `legal_actions`, reusing cached scores for a repeated position.
+
+    The cache key is the state's `position_key()`, the target card and the
+    actions themselves, so a reordered or filtered action list never reuses
+    scores that were computed for a different list.
+    """
+    target = self.target_card
+    if self.score_cache_size <= 0:
+      return self.evaluation.score_actions(state, self.seat_id, target, legal_actions).tolist()
+    cache = self._score_cache
+    key = (state.position_key(), target, tuple(legal_actions))
+    scores = cache.get(key)
+    if scores is not None:
+      cache.move_to_end(key)
+      return scores
+    scores = self.evaluation.score_actions(state, self.seat_id, target, legal_actions).tolist()
+    cache[key] = scores
+    if len(cache) > self.score_cache_size:
+      cache.popitem(last=False)
+    return scores
+
   def _reset(self) -> None:
     self.target_card = None
     self.card_history = []
@@ -149,16 +258,20 @@ class TargetAgent(Agent):
     use this opportunity to choose a new target card.
     """
     if self.target_card is None:
-      visible_cards = list(state.visible_cards) + list(state.players[self.seat_id].reserved_cards)
-      if self.target_card not in visible_cards:
-        self.target_card = self.rng.choice(visible_cards) if len(visible_cards) > 0 else None
+      # pick uniformly over visible + reserved cards by index, which draws
+      # the same as rng.choice on their concatenation without building it
+      visible = state.visible_cards
+      reserved = state.players[self.seat_id].reserved_cards
+      n = len(visible) + len(reserved)
+      if n > 0:
+        i = self.rng.randrange(n)
+        self.target_card = visible[i] if i < len(visible) else reserved[i - len(visible)]
 
   def _metadata(self) -> dict:
     return {
         # "card_history": self.card_history,
         AGENT_METADATA_HISTORY_ROUND: [str(card) if card else "None" for card in self.card_history],
-        "evaluation": self.evaluation.__class__.__name__,
-        "evaluation_config": asdict(self.evaluation.config),
+        **self._eval_metadata,
     }
 
 
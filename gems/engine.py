@@ -8,19 +8,22 @@ development in the repository root so callers have a stable, package-level
 entrypoint.
 """
 
+from dataclasses import replace
+from functools import lru_cache
 from typing import Any
-from collections.abc import Sequence
+from collections.abc import Iterator, Mapping, Sequence
 
 from pydantic import BaseModel
 
 from .agents.core import Agent, BaseAgent
 from .consts import GAME_ASSETS_DEFAULT, GAME_ASSETS_EMPTY, GameAssets, GameConfig
 
-from .typings import ActionType, Gem, Card, Role
+from .typings import ActionType, Gem, Card, CardList, Role
 from .state import PlayerState, GameState
 from .actions import Action, BuyCardAction, NoopAction, ReserveCardAction, Take2Action, Take3Action
 from pathlib import Path
 import random
+import sys
 
 
 class Engine:
@@ -35,14 +38,25 @@ class Engine:
   - `print_summary()` to display a human readable summary
   """
 
+  # rollouts clone engines in bulk; slots drop the per-instance __dict__
+  __slots__ = (
+      'config', '_num_players', '_names', '_state', 'decks_by_level', 'roles_deck',
+      '_rng', '_action_history', '_initial_assets', '_seed', '_all_noops_last_round',
+  )
+
   config: GameConfig
   _num_players: int
+  _names: list[str] | None
   _state: GameState
-  decks_by_level: dict[int, list[Card]]
-  roles_deck: list[Role]
+  # decks are immutable tuples, top card last; draws rebind a shorter slice,
+  # so clones and resets share them instead of copying
+  decks_by_level: dict[int, tuple[Card, ...]]
+  roles_deck: tuple[Role, ...]
   _rng: random.Random
   _action_history: list[Action]
   _initial_assets: GameAssets
+  _seed: int | None
+  _all_noops_last_round: bool
 
   def __init__(
       self,
@@ -51,20 +65,20 @@ class Engine:
       names: list[str] | None,
       state: GameState,
       assets: GameAssets,
-      decks_by_level: dict[int, list[Card]] | None = None,
-      roles_deck: list[Role] | None = None,
+      decks_by_level: dict[int, tuple[Card, ...]] | None = None,
+      roles_deck: tuple[Role, ...] | None = None,
       rng: random.Random,
       config: GameConfig | None = None,
       seed: int | None = None,
       all_noops_last_round: bool = False,
-      action_history: list[Action] = [],
+      action_history: list[Action] | None = None,
   ) -> None:
     self._num_players = num_players
     self._names = names
     self._state = state
     self._initial_assets = assets
-    self.decks_by_level = assets.new_decks_by_level() if decks_by_level is None else decks_by_level
-    self.roles_deck = assets.new_roles_deck() if roles_deck is None else roles_deck
+    self.decks_by_level = dict(assets.decks_by_level) if decks_by_level is None else decks_by_level
+    self.roles_deck = assets.roles_deck if roles_deck is None else roles_deck
     self._rng = rng
     # store/use provided configuration (fall back to sensible default)
     self.config = config or GameConfig(num_players=num_players)
@@ -72,7 +86,7 @@ class Engine:
     # engines can be reproduced deterministically
     self._seed = seed
     self._all_noops_last_round = all_noops_last_round
-    self._action_history = action_history
+    self._action_history = list(action_history) if action_history else []
 
   @staticmethod
   def new(
@@ -82,12 +96,18 @@ class Engine:
       config: GameConfig | None = None,
   ) -> "Engine":
     # basic validation: at least 1 player
+    if num_players is None:
+      if config is None:
+        raise ValueError("Either num_players or config must be provided")
+      num_players = config.num_players
 
-    # create minimal starting state using the provided config
-    state = Engine.create_game(num_players, names, config)
+    # create minimal starting state using the provided config; both it and
+    # the seeded shuffle are immutable, so games dealt alike share them
+    state = _starting_state(num_players, tuple(names) if names is not None else None,
+                            config or GameConfig(num_players=num_players))
     config = state.config
     num_players = state.config.num_players
-    assets = GAME_ASSETS_DEFAULT.shuffle(seed)
+    assets = _shuffled_assets(seed) if seed is not None else GAME_ASSETS_DEFAULT.shuffle(seed)
     engine = Engine(
       num_players=num_players,
       names=names,
@@ -98,16 +118,24 @@ class Engine:
       seed=seed,
     )
     visible_cards: list[Card] = []
+    per_level = engine.config.card_visible_count
+    decks = engine.decks_by_level
     for lvl in engine.config.card_levels:
-      drawn = engine.draw_from_deck(lvl, engine.config.card_visible_count)
-      visible_cards.extend(reversed(drawn))
-    roles_to_draw = engine._num_players + 1
-    visible_roles = []
-    for _ in range(min(roles_to_draw, len(engine.roles_deck))):
-      visible_roles.append(engine.roles_deck.pop())
-    engine._state = GameState(config=config, players=engine._state.players, bank=engine._state.bank,
-                              visible_cards_in=visible_cards, visible_roles_in=visible_roles,
-                              turn=engine._state.turn)
+      deck = decks.get(lvl)
+      if not deck:
+        continue
+      # the top cards, already in the order draw_from_deck would reverse to
+      cut = len(deck) - min(per_level, len(deck))
+      visible_cards.extend(deck[cut:])
+      decks[lvl] = deck[:cut]
+    roles_to_draw = min(engine._num_players + 1, len(engine.roles_deck))
+    roles_deck = engine.roles_deck
+    visible_roles = roles_deck[len(roles_deck) - roles_to_draw:][::-1]
+    engine.roles_deck = roles_deck[:len(roles_deck) - roles_to_draw]
+    # only the dealt cards and roles change; config, players and bank are
+    # already normalized and are shared as they are
+    engine._state = replace(engine._state, visible_cards=CardList(visible_cards),
+                            visible_roles=tuple(visible_roles))
     engine._all_noops_last_round = False
     engine._action_history = []
     return engine
@@ -124,17 +152,37 @@ class Engine:
         num_players=self._num_players,
         names=self._names,
         state=self._state,
-        decks_by_level={lvl: list(deck) for lvl, deck in self.decks_by_level.items()},
-        roles_deck=list(self.roles_deck),
+        # the decks are immutable, so only the level mapping is copied
+        decks_by_level=dict(self.decks_by_level),
+        roles_deck=self.roles_deck,
         assets=self._initial_assets,
         rng=random.Random(seed),  # new RNG instance
         config=self.config,
         seed=self._seed,
         all_noops_last_round=self._all_noops_last_round,
-        action_history=list(self._action_history),
+        action_history=self._action_history,
     )
     return engine
 
+  def refill_from(self, source: "Engine", seed: int | None = None) -> None:
+    """Make this engine equivalent to `source.clone(seed)`, in place.
+
+    The deck mapping and history list are reused rather than reallocated,
+    which is what `EnginePool` relies on to recycle engines.
+    """
+    self._num_players = source._num_players
+    self._names = source._names
+    self._state = source._state
+    self._initial_assets = source._initial_assets
+    _fill_decks(self.decks_by_level, source.decks_by_level)
+    self.roles_deck = source.roles_deck
+    # Random(seed) is Random().seed(seed), so reseeding matches clone()
+    self._rng.seed(seed)
+    self.config = source.config
+    self._seed = source._seed
+    self._all_noops_last_round = source._all_noops_last_round
+    self._action_history[:] = source._action_history
+
 
   def export(self) -> "Replay":
     """Export this Engine's state and history as a Replay object."""
@@ -193,11 +241,15 @@ class Engine:
     names = names or self._names
     if names is not None:
       assert len(names) == self._num_players
-    self._state = self.create_game(self._num_players, names, self.config)
+    # the starting state is immutable, so resets with the same players and
+    # config share one instead of rebuilding it
+    self._state = _starting_state(self._num_players, tuple(names) if names is not None else None, self.config)
     self._num_players = self._num_players
     self._names = names
-    self.decks_by_level = self._initial_assets.new_decks_by_level()
-    self.roles_deck = self._initial_assets.new_roles_deck()
+    # the initial decks are immutable and shared as they are: rollouts reset
+    # the same engine many times, and nothing is copied
+    _fill_decks(self.decks_by_level, self._initial_assets.decks_by_level)
+    self.roles_deck = self._initial_assets.roles_deck
     self._action_history = []
     self._all_noops_last_round = False
 
@@ -217,7 +269,12 @@ class Engine:
     # for p in self._state.players:
     #   print(f"  seat={p.seat_id} name={p.name!r} score={p.score} gems={p.gems.normalized()} discounts={p.discounts.normalized()} cards={len(p.purchased_cards)} reserved={len(p.reserved_cards)}")
     # print(f"Bank: {self._state.bank.normalized()}")
-    self._state.print_summary(show_visible_cards=False)
+    # one write for the whole summary instead of one per line
+    sys.stdout.write("".join(self._summary_parts()))
+
+  def _summary_parts(self) -> list[str]:
+    """Return the lines of `print_summary`, each ending in a newline."""
+    parts = self._state._summary_parts(show_visible_cards=False)
     # Build a simple table: deck-count followed by visible card titles for each level
     cards_table: list[str] = []
     for lvl in self.config.card_levels:
@@ -229,32 +286,40 @@ class Engine:
         line = f"{deck_count:3d}\t"
       cards_table.append(line)
 
-    print("Visible cards:\n" + "\n".join([line for line in cards_table if line.strip() and not line.strip().startswith('0')]))
+    parts.append("Visible cards:\n" + "\n".join([line for line in cards_table if line.strip() and not line.strip().startswith('0')]) + "\n")
+    return parts
 
-  def get_deck(self, level: int) -> list[Card]:
-    return list(self.decks_by_level.get(level, []))
+  def get_deck(self, level: int) -> tuple[Card, ...]:
+    """Return the deck of `level`, top card last."""
+    return self.decks_by_level.get(level, ())
 
-  def get_roles(self) -> list[Role]:
-    return list(self.roles_deck)
+  def get_roles(self) -> tuple[Role, ...]:
+    """Return the roles deck."""
+    return self.roles_deck
 
   def draw_from_deck(self, level: int, n: int = 1) -> list[Card]:
     """Remove and return up to `n` cards from the deck of `level`.
 
-    Pops from the end of the level list (treating the end as the top of the
-    deck) which is efficient for Python lists.
+    Takes from the end of the level tuple (treating the end as the top of the
+    deck) and rebinds the level to the remaining cards; the drawn cards come
+    top first.
     """
-    deck = self.decks_by_level.get(level, [])
-    drawn: list[Card] = []
-    for _ in range(min(n, len(deck))):
-      drawn.append(deck.pop())
+    deck = self.decks_by_level.get(level, ())
+    k = min(n, len(deck))
+    if k <= 0:
+      return []
+    cut = len(deck) - k
+    drawn = list(deck[cut:])
+    drawn.reverse()
+    self.decks_by_level[level] = deck[:cut]
     return drawn
 
-  def peek_deck(self, level: int, n: int = 1) -> list[Card]:
+  def peek_deck(self, level: int, n: int = 1) -> tuple[Card, ...]:
     """Return up to `n` cards from the top of the deck without removing them."""
-    deck = self.decks_by_level.get(level, [])
-    if not deck:
-      return []
-    return list(deck[-n:]) if n > 0 else []
+    deck = self.decks_by_level.get(level)
+    if not deck or n <= 0:
+      return ()
+    return deck[-n:]
 
   def get_legal_actions(self, seat_id: int | None = None) -> list[Action]:
     """Return a list of legal `Action` objects for the given player seat.
@@ -276,6 +341,15 @@ class Engine:
     seat_id = seat_id if seat_id is not None else self._state.turn % len(self._state.players)
     return self._state.players[seat_id].get_legal_actions(self._state)
 
+  def iter_legal_actions(self, seat_id: int | None = None) -> Iterator[Action]:
+    """Lazily yield the legal actions for `seat_id`, buys first.
+
+    Yields the same actions as `get_legal_actions` in a different order; see
+    `PlayerState.iter_legal_actions`.
+    """
+    seat_id = seat_id if seat_id is not None else self._state.turn % len(self._state.players)
+    return self._state.players[seat_id].iter_legal_actions(self._state)
+
   def advance_turn(self) -> None:
     """Advance the turn to the next player.
 
@@ -284,27 +358,30 @@ class Engine:
     """
     self._state = self._state.advance_turn(self.decks_by_level)
 
-  def play_one_round(self, agents: list[BaseAgent], debug=True) -> GameState:
+  def play_one_round(self, agents: list[BaseAgent], debug=False) -> GameState:
     """Play a full round (one turn per player) using specific Agents.
 
     This is a convenience for quick simulations and testing. It does not
-    check for game end conditions.
+    check for game end conditions. With `debug`, each turn's action and the
+    resulting summary are written to stdout.
     """
     all_noops = True
     num_players = len(self._state.players)
     for seat in range(num_players):
-      state = self.get_state()
+      state = self._state
       agent = agents[seat]
-      actions = self.get_legal_actions(seat)
-      if not all(a.type == ActionType.NOOP for a in actions):
+      # same as self.get_legal_actions(seat), minus the wrapper hops
+      actions = state.players[seat].get_legal_actions(state)
+      # stops at the first non-noop action; skipped once any seat had one
+      if all_noops and any(a.type is not ActionType.NOOP for a in actions):
         all_noops = False
       action = agent.act(state, actions)
       # apply action and update engine state
       self._state = action.apply(state)
       self._action_history.append(action)
       if debug:
-        print(f"Turn {state.turn} — player {seat} performs: {action}")
-        self.print_summary()
+        # one write per turn, so agents' own output still interleaves in order
+        sys.stdout.write("".join([f"Turn {state.turn} — player {seat} performs: {action}\n", *self._summary_parts()]))
       self.advance_turn()
     if all_noops:
       self._all_noops_last_round = True
@@ -314,14 +391,32 @@ class Engine:
     """Return True if any player has reached the winning score (15 points)."""
     if self._all_noops_last_round:
       return True
-    winners = self.game_winners()
-    return len(winners) > 0
+    # stops at the first winner without building game_winners()' list
+    return any(p.score >= 15 for p in self._state.players)
 
   def game_winners(self) -> list[PlayerState]:
     """Return a list of players who have reached the winning score (15 points)."""
     return [p for p in self._state.players if p.score >= 15]
 
 
+def _fill_decks(target: dict[int, tuple[Card, ...]], source: Mapping[int, tuple[Card, ...]]) -> None:
+  """Make `target` hold the decks of `source`, sharing the immutable decks."""
+  target.clear()
+  target.update(source)
+
+
+@lru_cache(maxsize=16)
+def _starting_state(num_players: int, names: tuple[str, ...] | None, config: GameConfig) -> GameState:
+  """`Engine.create_game`, cached for `Engine.new` and `Engine.reset`."""
+  return Engine.create_game(num_players, list(names) if names is not None else None, config)
+
+
+@lru_cache(maxsize=128)
+def _shuffled_assets(seed: int) -> GameAssets:
+  """`GAME_ASSETS_DEFAULT.shuffle(seed)`, cached per seed for `Engine.new`."""
+  return GAME_ASSETS_DEFAULT.shuffle(seed)
+
+
 class Replay(BaseModel):
   config: GameConfig
   assets: GameAssets
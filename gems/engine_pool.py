@@ -0,0 +1,57 @@
+"""Recycling of `Engine` objects for rollout-heavy callers.
+
+Search agents that clone an engine per rollout throw the copy away a few
+turns later. `EnginePool` keeps released engines around and refills their
+deck mapping and history list in place on the next clone, so each rollout
+reuses the same handful of objects instead of allocating new ones.
+"""
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from .engine import Engine
+
+
+class EnginePool:
+  """A bounded free-list of `Engine` objects.
+
+  `clone(engine, seed)` returns an engine equivalent to `engine.clone(seed)`;
+  callers hand it back with `release()` once the rollout is done and must not
+  use it afterwards. `borrow(engine, seed)` pairs the two around a `with`
+  block. At most `max_size` released engines are kept.
+  """
+
+  def __init__(self, max_size: int = 100):
+    if max_size < 0:
+      raise ValueError("max_size must be >= 0")
+    self.max_size = max_size
+    self._free: list[Engine] = []
+
+  def __len__(self) -> int:
+    return len(self._free)
+
+  def clone(self, engine: Engine, seed: int | None = None) -> Engine:
+    if not self._free:
+      return engine.clone(seed)
+    target = self._free.pop()
+    target.refill_from(engine, seed)
+    return target
+
+  def release(self, engine: Engine) -> None:
+    if len(self._free) < self.max_size:
+      self._free.append(engine)
+
+  @contextmanager
+  def borrow(self, engine: Engine, seed: int | None = None) -> Iterator[Engine]:
+    """Yield `clone(engine, seed)` and release it when the block exits."""
+    borrowed = self.clone(engine, seed)
+    try:
+      yield borrowed
+    finally:
+      self.release(borrowed)
+
+  def clear(self) -> None:
+    self._free.clear()
+
+
+__all__ = ["EnginePool"]
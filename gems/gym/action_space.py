@@ -15,6 +15,7 @@ from gymnasium import spaces
 from ..actions import Action, BuyCardAction, BuyCardActionGold, ReserveCardAction, Take2Action, Take3Action
 from ..typings import Gem, ActionType, CardIdx
 from ..consts import GameConfig
+from ..state import GameState
 
 from ._common import NDArray1D, Scalar
 from .sampling import sample_exact, sample_single
@@ -150,7 +151,7 @@ class Take3Space(spaces.Dict):
     take3['gems_count'][...] = len(action.gems)
     take3['ret'][...] = 0
     ret_count = 0
-    for gem, amount in action.ret or ():
+    for gem, amount in action.ret:
       ret_count += amount
       take3['ret'][self.config.gem_idx[gem]] = int(amount)
     take3['ret_count'][...] = ret_count
@@ -215,9 +216,9 @@ class Take2Space(spaces.Dict):
     take2 = data
     take2['gem'][...] = self.config.gem_idx[action.gem]
     take2['count'][...] = int(action.count)
-    take2['ret_count'][...] = action.ret.count() if action.ret is not None else 0
+    take2['ret_count'][...] = action.ret.count()
     take2['ret'][...] = 0
-    for gem_ret, amount in action.ret or ():
+    for gem_ret, amount in action.ret:
       take2['ret'][self.config.gem_idx[gem_ret]] = int(amount)
 
   def _decode(self, data: "Take2Dict") -> Take2Action:
@@ -515,8 +516,72 @@ class ActionSpace(spaces.Dict):
       return Action.noop()
     raise ValueError(f"Unsupported action type for decode: {atype}")
 
+  def validate(self, data: "ActionDict", state: GameState | None = None, seat_id: int = 0, deck_sizes: dict[int, int] | None = None) -> bool:
+    """Return whether `data` decodes to an action whose card lookup succeeds.
+
+    Performs the structural checks `decode` (and a subsequent
+    `state.get_card`) would otherwise fail with an exception: the type
+    index must be in range and buy/reserve card indices must flatten back
+    to a CardIdx. When `state` is given, that CardIdx must also point at an
+    existing visible card or at one of `seat_id`'s reserved cards.
+
+    A deck-head index is never valid for a buy. For a reserve it is valid
+    when that level's deck is non-empty in `deck_sizes` (level -> cards
+    left); the public state does not carry the decks, so without
+    `deck_sizes` every deck-head reserve is accepted.
+    """
+    tval = int(data['type'])
+    if tval < 0 or tval >= len(self._type_order):
+      return False
+    atype = self._type_order[tval]
+    if atype == ActionType.BUY_CARD:
+      flat = int(data['buy']['card_idx'])
+    elif atype == ActionType.RESERVE_CARD:
+      flat = int(data['reserve']['card_idx'])
+    else:
+      return True
+    idx = self.config.unflatten_card_idx(flat)
+    if idx is None:
+      return False
+    if idx.deck_head_level is not None:
+      if atype == ActionType.BUY_CARD:
+        return False
+      return deck_sizes is None or deck_sizes.get(idx.deck_head_level, 0) > 0
+    if state is None:
+      return True
+    if idx.visible_idx is not None:
+      return idx.visible_idx < len(state.visible_cards)
+    assert idx.reserve_idx is not None
+    return idx.reserve_idx < len(state.players[seat_id].reserved_cards)
+
   def decode_many(self, actions: Sequence["ActionDict"]) -> list[Action]:
     return [self.decode(a) for a in actions]
 
+  def sample_batch(self, n: int) -> list["ActionDict"]:
+    """Draw `n` samples, filling in only the sub-dict each sample's type selects.
+
+    All `n` action types are drawn with a single vectorized RNG call. Unlike
+    `sample()`, which samples every sub-space and lets `decode` ignore all
+    but one, each sample here only pays for the sub-space it uses; the
+    other sub-dicts are left zeroed as in `empty()`.
+    """
+    subspaces: dict[ActionType, tuple[str, spaces.Dict]] = {
+      ActionType.TAKE_3_DIFFERENT: ('take3', self._take3_space),
+      ActionType.TAKE_2_SAME: ('take2', self._take2_space),
+      ActionType.BUY_CARD: ('buy', self._buy_space),
+      ActionType.RESERVE_CARD: ('reserve', self._reserve_space),
+    }
+    types = self.spaces['type'].np_random.integers(0, len(self._type_order), size=n)
+    samples: list[ActionDict] = []
+    for tval in types.tolist():
+      data = self.empty()
+      data['type'][...] = tval
+      sub = subspaces.get(self._type_order[tval])
+      if sub is not None:
+        key, space = sub
+        data[key] = space.sample()  # type: ignore[literal-required]
+      samples.append(data)
+    return samples
+
 
 __all__ = ["ActionSpace"]
@@ -93,12 +93,10 @@ class StateSpace(spaces.Dict):
         },
       }
     player = state.players[seat_id]
-    for g, n in state.bank:
-      bank[GemIndex[g]] = n
-    for g, n in player.gems:
-      player_gems[GemIndex[g]] = n
-    for g, n in player.discounts:
-      player_discounts[GemIndex[g]] = n
+    # GemList.counts() is already laid out in GemIndex order
+    bank[:] = state.bank.counts()
+    player_gems[:] = player.gems.counts()
+    player_discounts[:] = player.discounts.counts()
     player_score[0] = int(player.score)
     turn_mod_players[...] = int(state.turn % self._num_players)
     cards = list(state.visible_cards)
@@ -112,8 +110,7 @@ class StateSpace(spaces.Dict):
       if card.bonus is not None:
         bonus_index = GemIndex[card.bonus] + 1
       visible_bonus[idx] = int(bonus_index)
-      for gem, cost in card.cost:
-        visible_costs[idx, GemIndex[gem]] = int(cost)
+      visible_costs[idx] = card.cost.counts()
     return {
       'bank': bank,
       'player_gems': player_gems,
@@ -1,5 +1,7 @@
-from dataclasses import InitVar, dataclass, field
-from collections.abc import Iterable, Mapping, Sequence
+from collections import OrderedDict
+from dataclasses import InitVar, dataclass, field, replace
+from collections.abc import Iterator, Mapping, Sequence
+import sys
 from typing import TYPE_CHECKING
 
 from gems.consts import GameConfig
@@ -10,53 +12,96 @@ if TYPE_CHECKING:
   from .actions import Action
 
 
-def _apply_discounts(cost: Iterable[tuple["Gem", int]], discounts: "GemList") -> list[tuple["Gem", int]]:
-  """Return a list of (Gem, effective_amount) after applying discounts.
+# legal-action lists by `PlayerState._legal_actions_key`, most recently used
+# last; the key covers every input, so entries never go stale, only get evicted
+_LEGAL_ACTIONS_CACHE: OrderedDict[tuple, list] = OrderedDict()
+_LEGAL_ACTIONS_CACHE_SIZE = 4096
 
-  Discounts are a GemList of (Gem, amt) pairs representing permanent
-  bonuses from purchased cards. Effective amounts are floored at zero.
+# read-only payment mappings by (cost slots, effective requirements, spend
+# caps, gold); dropped wholesale once it reaches the size limit
+_PAYMENTS_CACHE: dict[tuple, tuple[dict[Gem, int], ...]] = {}
+_PAYMENTS_CACHE_SIZE = 8192
+
+# slot of gold in GemList.counts()
+_GOLD_INDEX = GemList.GEM_ORDER.index(Gem.GOLD)
+
+
+def _enumerate_payments(gems_order: list[Gem], req_amounts: list[int], max_spend: list[int],
+                        gold_available: int) -> list[dict[Gem, int]]:
+  """Enumerate every exact payment for effective requirements `req_amounts`.
+
+  `max_spend[i]` caps the colored gems spent on `gems_order[i]`; any rest is
+  paid in gold, up to `gold_available`.
   """
-  discount_map: dict["Gem", int] = {g: n for g, n in discounts}
-  effective: list[tuple["Gem", int]] = []
-  for g, req in cost:
-    disc = discount_map.get(g, 0)
-    eff = req - disc
-    if eff < 0:
-      eff = 0
-    effective.append((g, eff))
-  return effective
-
-
-@dataclass(frozen=True)
+  # min_deficit[i]: gold still needed if colors i.. are paid in full
+  n = len(req_amounts)
+  min_deficit = [0] * (n + 1)
+  for i in range(n - 1, -1, -1):
+    min_deficit[i] = min_deficit[i + 1] + req_amounts[i] - max_spend[i]
+  if min_deficit[0] > gold_available:
+    return []
+
+  payments: list[dict[Gem, int]] = []
+  spends = [0] * n
+
+  def rec(i: int, gold_left: int) -> None:
+    # only spends that leave enough gold for the remaining colors are
+    # visited, in ascending order, so payments come out in the same order
+    # as the filtered cartesian product of all spends
+    if i == n:
+      pay: dict[Gem, int] = {}
+      for g, spend in zip(gems_order, spends):
+        if spend > 0:
+          pay[g] = spend
+      deficit = gold_available - gold_left
+      if deficit > 0:
+        pay[Gem.GOLD] = deficit
+      payments.append(pay)
+      return
+    req = req_amounts[i]
+    lo = max(0, req - (gold_left - min_deficit[i + 1]))
+    for spend in range(lo, max_spend[i] + 1):
+      spends[i] = spend
+      rec(i + 1, gold_left - (req - spend))
+
+  rec(0, gold_available)
+  return payments
+
+
+@dataclass(frozen=True, slots=True)
 class PlayerState:
   """Per-player snapshot with small helper methods.
 
   This class mirrors the previous definition from `typings.py` but adds
   convenience methods `get_legal_actions` and `can_afford` so callers can
   ask a player about their options directly.
+
+  `gems`, `reserved_cards` and `purchased_cards` accept any GemList/CardList
+  input and are normalized on construction, so apply sites can derive a new
+  player with `dataclasses.replace(player, gems=...)` and share the
+  untouched fields.
   """
   seat_id: int
   name: str | None = None
-  gems_in: InitVar[Iterable[tuple[Gem, int]] | Mapping[Gem, int] | GemList | None] = None
   gems: GemList = field(default_factory=GemList)
   score: int = 0
-  reserved_cards_in: InitVar[Iterable[Card]] = ()
-  reserved_cards: CardList = field(init=False, default_factory=CardList)
-  purchased_cards_in: InitVar[Iterable[Card]] = ()
-  purchased_cards: CardList = field(init=False, default_factory=CardList)
+  reserved_cards: CardList = field(default_factory=CardList)
+  purchased_cards: CardList = field(default_factory=CardList)
   discounts: GemList = field(init=False, default_factory=GemList)
 
-  def __post_init__(self, gems_in, reserved_cards_in, purchased_cards_in):
-    if gems_in is not None:
-      object.__setattr__(self, 'gems', GemList(gems_in))
-    object.__setattr__(self, 'reserved_cards', CardList(tuple(reserved_cards_in)))
-    purchased = tuple(purchased_cards_in)
-    object.__setattr__(self, 'purchased_cards', CardList(purchased))
+  def __post_init__(self):
+    if not isinstance(self.gems, GemList):
+      object.__setattr__(self, 'gems', GemList(self.gems))
+    if not isinstance(self.reserved_cards, CardList):
+      object.__setattr__(self, 'reserved_cards', CardList(tuple(self.reserved_cards)))
+    if not isinstance(self.purchased_cards, CardList):
+      object.__setattr__(self, 'purchased_cards', CardList(tuple(self.purchased_cards)))
 
     counts: dict = {}
-    for c in purchased:
-      if getattr(c, 'bonus', None) is not None:
-        counts[c.bonus] = counts.get(c.bonus, 0) + 1
+    for c in self.purchased_cards:
+      bonus = c.bonus
+      if bonus is not None:
+        counts[bonus] = counts.get(bonus, 0) + 1
     object.__setattr__(self, 'discounts', GemList(tuple(counts.items())))
 
   def check_afford(self, card: Card, payment: dict[Gem, int]) -> bool:
@@ -65,71 +110,148 @@ class PlayerState:
     possible_payments = self.can_afford(card)
     return payment in possible_payments
 
+  def affordable(self, cards: Sequence[Card]) -> list[bool]:
+    """Return, for each of `cards`, whether this player can pay for it.
+
+    A card is affordable when the gold held covers the summed per-color
+    shortfall after discounts, i.e. exactly when `can_afford` would return
+    at least one payment. Checking a whole board this way is much cheaper
+    than enumerating payments for cards the player cannot buy.
+    """
+    have = self.gems.counts()
+    discounts = self.discounts.counts()
+    gold_available = have[_GOLD_INDEX]
+    result: list[bool] = []
+    for card in cards:
+      shortfall = 0
+      for _, i, req in card.cost.indexed():
+        missing = req - discounts[i] - have[i]
+        if missing > 0:
+          shortfall += missing
+      result.append(shortfall <= gold_available)
+    return result
+
   def can_afford(self, card: Card) -> list[dict[Gem, int]]:
     """Return all exact payment dicts this player could use to buy `card`.
 
     Mirrors the previous `can_afford` helper but scoped to this player's
-    available gems (`self.gems`).
+    available gems (`self.gems`). The enumeration is cached for calls that
+    reduce to the same requirements; each call gets its own copies.
     """
-    player_gems: dict[Gem, int] = {g: amt for g, amt in self.gems}
-    gold_available = player_gems.get(Gem.GOLD, 0)
+    # positional counts: no Gem hashing in the per-card loop
+    have = self.gems.counts()
+    discounts = self.discounts.counts()
+    gold_available = have[_GOLD_INDEX]
 
-    # Apply permanent discounts from purchased cards to the card cost
-    requirements = list(card.cost)
-    effective_requirements = _apply_discounts(requirements, self.discounts)
-
-    # If no effective requirements remain, the card is free (via discounts)
-    if not effective_requirements or all(req == 0 for _, req in effective_requirements):
-      return [{}]
-
-    ranges = []
+    # Apply permanent discounts from purchased cards to the card cost,
+    # keeping the cost's own gem order for the payment dicts
     gems_order: list[Gem] = []
+    slots: list[int] = []
     req_amounts: list[int] = []
-    for g, req in effective_requirements:
+    max_spend: list[int] = []
+    shortfall = 0
+    for g, i, req in card.cost.indexed():
+      req -= discounts[i]
+      if req < 0:
+        req = 0
+      spend = min(have[i], req)
+      shortfall += req - spend
       gems_order.append(g)
+      slots.append(i)
       req_amounts.append(req)
-      have = player_gems.get(g, 0)
-      max_colored = min(have, req)
-      ranges.append(range(0, max_colored + 1))
-
-    from itertools import product
-
-    payments: list[dict[Gem, int]] = []
-    for combo in product(*ranges):
-      deficit = 0
-      for spend, req in zip(combo, req_amounts):
-        if spend < req:
-          deficit += (req - spend)
-      if deficit <= gold_available:
-        pay: dict[Gem, int] = {}
-        for g, spend in zip(gems_order, combo):
-          if spend > 0:
-            pay[g] = spend
-        if deficit > 0:
-          pay[Gem.GOLD] = deficit
-        payments.append(pay)
-
-    return payments
+      max_spend.append(spend)
+    if shortfall > gold_available:
+      return []
+
+    # If no effective requirements remain, the card is free (via discounts)
+    if not any(req_amounts):
+      return [{}]
+
+    # the payments only depend on these integers, so positions that share
+    # them (most of a search tree, many cards of a level) share one result
+    key = (tuple(slots), tuple(req_amounts), tuple(max_spend), gold_available)
+    cached = _PAYMENTS_CACHE.get(key)
+    if cached is None:
+      cached = tuple(_enumerate_payments(gems_order, req_amounts, max_spend, gold_available))
+      if len(_PAYMENTS_CACHE) >= _PAYMENTS_CACHE_SIZE:
+        _PAYMENTS_CACHE.clear()
+      _PAYMENTS_CACHE[key] = cached
+    return [dict(pay) for pay in cached]
+
 
   def can_reserve(self, config: GameConfig) -> bool:
     """Return whether this player can reserve another card."""
     return len(self.reserved_cards) < config.card_max_count_reserved
 
   def get_legal_actions(self, state: "GameState") -> list["Action"]:
+    """Enumerate a permissive set of legal actions for this player.
+
+    Delegates to each Action subclass' `_get_legal_actions` classmethod so
+    logic is co-located with the action definitions. Falls back to a
+    single NoopAction if no actions are available.
+
+    Results are cached by the inputs of the enumeration only: the bank,
+    the visible cards and this player's hand, discounts and reserves. Asking
+    again for the same position (e.g. the gym env's info and its next
+    `step`), or for one that differs only in other players' holdings,
+    returns a copy of the cached list instead of a fresh enumeration.
+    """
+    key = self._legal_actions_key(state)
+    cached = _LEGAL_ACTIONS_CACHE.get(key)
+    if cached is not None:
+      _LEGAL_ACTIONS_CACHE.move_to_end(key)
+      return list(cached)
+    actions = self._enumerate_legal_actions(state)
+    _LEGAL_ACTIONS_CACHE[key] = actions
+    if len(_LEGAL_ACTIONS_CACHE) > _LEGAL_ACTIONS_CACHE_SIZE:
+      _LEGAL_ACTIONS_CACHE.popitem(last=False)
+    return list(actions)
+
+  def _legal_actions_key(self, state: "GameState") -> tuple:
+    # score, seat and purchased cards beyond their discounts play no part;
+    # cards are keyed by value, since the cached actions hold the cards and
+    # different card sets may reuse ids
+    return (
+        _gems_key(state.bank),
+        state.visible_cards.as_tuple(),
+        _gems_key(self.gems),
+        _gems_key(self.discounts),
+        self.reserved_cards.as_tuple(),
+        state.config,
+    )
+
+  def iter_legal_actions(self, state: "GameState") -> Iterator["Action"]:
+    """Lazily yield the same actions as `get_legal_actions`, buys first.
+
+    Categories come in the order most useful to a pruning search: buys,
+    then take-3, take-2 and reserves. Each category is only enumerated once
+    the caller has consumed the previous one, so breaking early skips the
+    rest. Yields a single NoopAction if nothing else is legal.
+    """
+    from .actions import (
+        Action,
+        Take3Action,
+        Take2Action,
+        BuyCardAction,
+        ReserveCardAction,
+    )
+    config = state.config
+    found = False
+    for action_cls in (BuyCardAction, Take3Action, Take2Action, ReserveCardAction):
+      for action in action_cls._get_legal_actions(self, state, config):
+        found = True
+        yield action
+    if not found:
+      yield Action.noop()
+
+  def _enumerate_legal_actions(self, state: "GameState") -> list["Action"]:
     from .actions import (
         Action,
         Take3Action,
         Take2Action,
         BuyCardAction,
         ReserveCardAction,
-        NoopAction,
     )
-    """Enumerate a permissive set of legal actions for this player.
-
-    Delegates to each Action subclass' `_get_legal_actions` classmethod so
-    logic is co-located with the action definitions. Falls back to a
-    single NoopAction if no actions are available.
-    """
     config = state.config
     actions: list[Action] = []
     # Gather from each action type
@@ -143,7 +265,7 @@ class PlayerState:
     return actions
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class GameState:
   """A read-only view of the full public game state.
 
@@ -169,12 +291,16 @@ class GameState:
     # iterables; we try to be forgiving.
     if bank_in is not None:
       object.__setattr__(self, 'bank', GemList(bank_in))
+    elif not isinstance(self.bank, GemList):
+      object.__setattr__(self, 'bank', GemList(self.bank))
     if visible_cards_in is not None:
       object.__setattr__(self, 'visible_cards', CardList(visible_cards_in))
+    elif not isinstance(self.visible_cards, CardList):
+      object.__setattr__(self, 'visible_cards', CardList(self.visible_cards))
     if visible_roles_in is not None:
       object.__setattr__(self, 'visible_roles', tuple(visible_roles_in))
-    object.__setattr__(self, 'players', tuple(self.players))
-    object.__setattr__(self, 'visible_cards', CardList(self.visible_cards))
+    if not isinstance(self.players, tuple):
+      object.__setattr__(self, 'players', tuple(self.players))
 
     num_players = len(self.players)
     if num_players <= 0:
@@ -193,48 +319,104 @@ class GameState:
       return player.reserved_cards[idx.reserve_idx]
     raise IndexError("CardIdx must have either visible_idx or reserve_idx set")
 
-  def advance_turn(self, decks_by_level: dict[int, list[Card]] | None = None) -> 'GameState':
+  def position_key(self) -> tuple:
+    """Return a hashable key identifying this position.
+
+    Two states share a key when the side to move, bank, visible cards and
+    every player's gems, score and cards match, whatever turn they were
+    reached on; search agents use it to key transposition tables. Cards are
+    compared by value, not by id, so card sets that reuse ids never share
+    a key.
+    """
+    num_players = len(self.players)
+    return (
+        self.turn % num_players,
+        _gems_key(self.bank),
+        self.visible_cards.as_tuple(),
+        tuple(
+            (_gems_key(p.gems), p.score,
+             p.reserved_cards.as_tuple(),
+             frozenset(p.purchased_cards))
+            for p in self.players
+        ),
+    )
+
+  def advance_turn(self, decks_by_level: dict[int, Sequence[Card]] | None = None) -> 'GameState':
     """Return a new GameState with the turn advanced by one.
 
-    If `decks_by_level` is provided (a mutable mapping level->list[Card])
-    the method will attempt to top up visible cards so that there are
-    `per_level` cards for each level present. This operation will pop
-    cards from the provided decks (mutating them) similar to how the
-    `Engine` draws cards. If `decks_by_level` is omitted no visible-card
-    refilling is performed.
+    If `decks_by_level` is provided (a mutable mapping level->deck, top
+    card last) the method will attempt to top up visible cards so that
+    there are `per_level` cards for each level present. Drawn cards are
+    removed by rebinding each level to its remaining slice (mutating the
+    mapping, not the decks) similar to how the `Engine` draws cards. If
+    `decks_by_level` is omitted no visible-card refilling is performed.
     """
-    # Start with current visible cards as a list we can extend
     per_level = self.config.card_visible_count
-    visible = list(self.visible_cards)
+    visible_cards = self.visible_cards
 
     if decks_by_level is not None:
-      # Count how many visible cards we currently have per level
-      counts: dict[int, int] = {}
-      for c in visible:
-        lvl = c.level
-        counts[lvl] = counts.get(lvl, 0) + 1
-
-      # For each known level in the decks, draw up to per_level
+      # most turns leave every level full: then nothing is copied and the
+      # visible CardList, with its cached level buckets, is shared as is
+      visible: list[Card] | None = None
       for lvl, deck in decks_by_level.items():
-        need = per_level - counts.get(lvl, 0)
-        for _ in range(min(need, len(deck))):
-          # pop from the end (deck treated LIFO with end as top)
-          visible.append(deck.pop())
+        k = min(per_level - len(visible_cards.get_level(lvl)), len(deck))
+        if k > 0:
+          if visible is None:
+            visible = list(visible_cards)
+          # take from the end (deck treated LIFO with end as top), top first
+          cut = len(deck) - k
+          visible.extend(reversed(deck[cut:]))
+          decks_by_level[lvl] = deck[:cut]
+      if visible is not None:
+        visible_cards = CardList(visible)
 
     # Return a new GameState with incremented turn and updated visible_cards
-    return GameState(config=self.config, players=self.players, bank=self.bank,
-                     visible_cards_in=visible, turn=self.turn + 1,
-                     last_action=self.last_action)
+    return replace(self, visible_cards=visible_cards, turn=self.turn + 1)
 
   def print_summary(self, show_visible_cards: bool = True) -> None:
-    print("--" * 20)
-    print(f"Round: {self.round} Turn: {self.turn}")
-    print("Players:")
-    for p in self.players:
-      print(f"  seat={p.seat_id} name={p.name!r} score={p.score} gems={p.gems.normalized()} discounts={p.discounts.normalized()} cards={len(p.purchased_cards)} reserved={len(p.reserved_cards)}")
-    print(f"Bank: {self.bank.normalized()}")
+    sys.stdout.write("".join(self._summary_parts(show_visible_cards)))
+
+  def _summary_parts(self, show_visible_cards: bool = True) -> list[str]:
+    """Return the lines of `print_summary`, each ending in a newline.
+
+    Callers join them and write once, rather than paying a locked stdout
+    write per line.
+    """
+    parts = ["--" * 20 + "\n", f"Round: {self.round} Turn: {self.turn}\n", "Players:\n"]
+    parts.extend(
+        f"  seat={p.seat_id} name={p.name!r} score={p.score} gems={p.gems.normalized()} discounts={p.discounts.normalized()} cards={len(p.purchased_cards)} reserved={len(p.reserved_cards)}\n"
+        for p in self.players)
+    parts.append(f"Bank: {self.bank.normalized()}\n")
 
     if show_visible_cards:
       cards_table = ["\t".join(["  {:25}".format(
           str(c)) for c in self.visible_cards.get_level(lvl)]) for lvl in self.config.card_levels]
-      print(f"Visible cards:\n{'\n'.join([line for line in cards_table if line.strip() != '0'])}")
+      parts.append("Visible cards:\n")
+      parts.extend(line + "\n" for line in cards_table if line.strip() != '0')
+    return parts
+
+
+def _gems_key(gems: GemList) -> int | tuple[int, ...]:
+  packed = gems.packed()
+  return packed if packed is not None else tuple(gems.as_array().tolist())
+
+
+def _derive_state(state: GameState, players: tuple[PlayerState, ...] | None = None,
+                  bank: GemList | None = None, visible_cards: CardList | None = None,
+                  last_action: "Action | None" = None) -> GameState:
+  """Return `state` with the fields an action touches swapped out.
+
+  Equivalent to `dataclasses.replace(state, ...)` for the action apply
+  path, but calls `GameState.__init__` directly with keyword arguments,
+  which skips replace()'s per-field getattr walk. Arguments left as None
+  are shared with `state`; `last_action` is always taken from the call.
+  """
+  return GameState(
+      config=state.config,
+      players=state.players if players is None else players,
+      bank=state.bank if bank is None else bank,
+      visible_cards=state.visible_cards if visible_cards is None else visible_cards,
+      visible_roles=state.visible_roles,
+      turn=state.turn,
+      last_action=last_action,
+  )
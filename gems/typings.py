@@ -1,9 +1,10 @@
 from dataclasses import InitVar
 from enum import Enum
-from typing import Any, TypeAlias
+from typing import Any, ClassVar, TypeAlias
 from pydantic import field_validator, model_validator, Field
 from pydantic.dataclasses import dataclass as pydantic_dataclass
 from collections.abc import Mapping, Iterator, Sequence
+import numpy as np
 
 from .utils import _to_kv_tuple
 
@@ -56,6 +57,16 @@ class GemList:
   Provides lightweight helpers to convert to/from dict and to iterate.
   """
   COLOR_ORDER = (Gem.BLUE, Gem.WHITE, Gem.BLACK, Gem.RED, Gem.GREEN, Gem.GOLD)
+  # index order of `as_array`, matching the declaration order of `Gem`
+  GEM_ORDER = tuple(Gem)
+  # `GEM_ORDER` without gold, for totals and takes that exclude it
+  NON_GOLD = tuple(g for g in GEM_ORDER if g != Gem.GOLD)
+  # shared empty instance, set below the class
+  EMPTY: ClassVar['GemList']
+  # class-level sentinels shadowed per instance once `packed()` / `count()`
+  # have run
+  _packed = -1
+  _count = -1
   _pairs_in: InitVar[Mapping['Gem', int] | tuple[tuple['Gem', int], ...] | list[tuple['Gem', int]]] = Field(default_factory=dict, alias='_pairs')
   _pairs: dict[Gem, int] = Field(init=False, default_factory=dict)
 
@@ -83,7 +94,8 @@ class GemList:
     return self._pairs[i]
 
   def __hash__(self) -> int:
-    return hash(frozenset(self.normalized()._pairs.items()))
+    # equal pair dicts have equal counts(), which are cached per instance
+    return hash(self.counts())
 
   def normalized(self) -> 'GemList':
     """Return a new GemList with all gems in COLOR_ORDER and zero counts removed."""
@@ -91,9 +103,34 @@ class GemList:
     normalized_pairs = tuple((g, counts[g]) for g in self.COLOR_ORDER if counts.get(g, 0) > 0)
     return GemList(normalized_pairs)
 
+  def packed(self) -> int | None:
+    """Return the counts packed into one int, 16 bits per gem in `GEM_ORDER`.
+
+    Each lane holds a count in 0..255; returns None when any count is
+    outside that range. The value is computed on first use and cached on the
+    instance.
+    """
+    if self._packed != -1:
+      return self._packed
+    packed: int | None = 0
+    for g, n in self._pairs.items():
+      if not 0 <= n <= 0xFF:
+        packed = None
+        break
+      packed |= n << _GEM_LANE_SHIFT[g]
+    object.__setattr__(self, '_packed', packed)
+    return packed
+
   def count(self) -> int:
-    """Return the total count of all gems in this GemList."""
-    return sum(self._pairs.values())
+    """Return the total count of all gems in this GemList.
+
+    Computed on first use and cached on the instance.
+    """
+    c = self._count
+    if c == -1:
+      c = sum(self._pairs.values())
+      object.__setattr__(self, '_count', c)
+    return c
 
   def count_distinct(self) -> int:
     """Return the count of distinct gem types in this GemList."""
@@ -102,6 +139,44 @@ class GemList:
   def get(self, gem: Gem) -> int:
     return self._pairs.get(gem, 0)
 
+  def as_array(self) -> np.ndarray:
+    """Return the counts as a read-only int array indexed in `GEM_ORDER`.
+
+    The array is built on first use and cached on the instance.
+    """
+    arr = self.__dict__.get('_array')
+    if arr is None:
+      counts = self._pairs
+      arr = np.array([counts.get(g, 0) for g in self.GEM_ORDER], dtype=np.int64)
+      arr.flags.writeable = False
+      object.__setattr__(self, '_array', arr)
+    return arr
+
+  def counts(self) -> tuple[int, ...]:
+    """Return the counts as a fixed-length tuple indexed in `GEM_ORDER`.
+
+    Positional lookups skip hashing the `Gem` keys, which is the main cost
+    of `get()` in tight loops. Built on first use and cached on the instance.
+    """
+    counts = self.__dict__.get('_counts')
+    if counts is None:
+      pairs = self._pairs
+      counts = tuple(pairs.get(g, 0) for g in self.GEM_ORDER)
+      object.__setattr__(self, '_counts', counts)
+    return counts
+
+  def indexed(self) -> tuple[tuple[Gem, int, int], ...]:
+    """Return `(gem, GEM_ORDER index, count)` triples in iteration order.
+
+    Lets callers walk the pairs in order while indexing `counts()` of other
+    GemLists by position. Built on first use and cached on the instance.
+    """
+    indexed = self.__dict__.get('_indexed')
+    if indexed is None:
+      indexed = tuple((g, _GEM_INDEX[g], n) for g, n in self._pairs.items())
+      object.__setattr__(self, '_indexed', indexed)
+    return indexed
+
   def to_dict(self) -> dict[Gem, int]:
     return dict(self._pairs)
 
@@ -120,6 +195,17 @@ class GemList:
 
   def __str__(self) -> str:  # pragma: no cover - convenience
     return "".join(f"{n}{g.color_circle()}" for g, n in self) or "⭕"
+
+
+GemList.EMPTY = GemList()
+
+# position of each gem in GemList.GEM_ORDER, i.e. declaration order
+_GEM_INDEX = {g: i for i, g in enumerate(Gem)}
+
+# lane layout for GemList.packed(): 16 bits per gem in declaration order
+_GEM_LANE_SHIFT = {g: 16 * i for i, g in enumerate(Gem)}
+
+
 GemListInput: TypeAlias = GemList | Mapping[Gem, int] | Sequence[tuple[Gem, int]]
 
 
@@ -223,8 +309,20 @@ class CardList(Sequence['Card']):
     return f"CardList({self._items!r})"
 
   def get_level(self, level: int) -> 'CardList':
-    """Return a new CardList containing only cards with the given level."""
-    return CardList([c for c in self._items if c.level == level])
+    """Return a CardList containing only cards with the given level.
+
+    All levels are bucketed in one pass on first use and cached on the
+    instance, so later calls are a dict lookup.
+    """
+    by_level = self.__dict__.get('_by_level')
+    if by_level is None:
+      buckets: dict[int, list[Card]] = {}
+      for c in self._items:
+        buckets.setdefault(c.level, []).append(c)
+      by_level = {lvl: CardList(cards) for lvl, cards in buckets.items()}
+      object.__setattr__(self, '_by_level', by_level)
+    found = by_level.get(level)
+    return found if found is not None else CardList()
 
   def find(self, card_id: str) -> Card | None:
     """Return the Card with the given ID, or None if not found."""
@@ -25,7 +25,7 @@ if __name__ == "__main__":
   # actions are available for the current player.
 
   while not engine.game_end():
-    engine.play_one_round(agents=agents)
+    engine.play_one_round(agents=agents, debug=True)
   winners = engine.game_winners()
   if winners:
     print("Game finished — winner(s):")
@@ -54,5 +54,5 @@ def test_target_agent():
   agents[0].reset(seed=42)
   engine = Engine.new(num_players=1, seed=42)
   while not engine.game_end():
-    engine.play_one_round(agents=agents)
+    engine.play_one_round(agents=agents, debug=True)
     print("===" * 20)
@@ -96,7 +96,7 @@ def single_play():
   engine.print_summary()
 
   while not engine.game_end():
-    engine.play_one_round(agents=[agent])
+    engine.play_one_round(agents=[agent], debug=True)
 
   winners = engine.game_winners()
   if winners:
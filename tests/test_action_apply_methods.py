@@ -1,3 +1,5 @@
+import pytest
+
 from gems.actions import (
   Take3Action,
   Take2Action,
@@ -14,8 +16,8 @@ def make_basic_state():
   # two players, bank with some tokens, one visible card
   config = GameConfig(num_players=2)
   players = (
-    PlayerState(seat_id=0, name='P0', gems_in=((Gem.RED, 0), (Gem.BLUE, 0))),
-    PlayerState(seat_id=1, name='P1', gems_in=((Gem.RED, 0), (Gem.BLUE, 0))),
+    PlayerState(seat_id=0, name='P0', gems=((Gem.RED, 0), (Gem.BLUE, 0))),
+    PlayerState(seat_id=1, name='P1', gems=((Gem.RED, 0), (Gem.BLUE, 0))),
   )
   bank = {Gem.RED: 4, Gem.BLUE: 4, Gem.GOLD: 1, Gem.WHITE: 4, Gem.BLACK: 4, Gem.GREEN: 4}
   card = Card(id='c1', level=1, points=1, bonus=Gem.RED, cost={Gem.RED: 1})
@@ -37,6 +39,11 @@ def test_take3_apply():
   bank = dict(new_state.bank)
   assert bank[Gem.RED] == 3
 
+  # a bank shortfall is rejected before any gems move
+  short = GameState(config=state.config, players=state.players, bank_in={Gem.BLUE: 4, Gem.WHITE: 4}, turn=0)
+  with pytest.raises(ValueError):
+    action._apply(short.players[0], short, short.config)
+
 
 def test_take2_apply():
   state = make_basic_state()
@@ -78,7 +85,7 @@ def test_buy_apply_from_visible():
   state = make_basic_state()
   # Give player a red gem to pay for the card
   p0 = state.players[0]
-  p0_with_gems = PlayerState(seat_id=0, name='P0', gems_in=((Gem.RED, 1),))
+  p0_with_gems = PlayerState(seat_id=0, name='P0', gems=((Gem.RED, 1),))
   players = (p0_with_gems, state.players[1])
   state = GameState(config=state.config, players=players, bank=state.bank, visible_cards=state.visible_cards, turn=0)
   card = next(iter(state.visible_cards))
@@ -13,6 +13,7 @@ from gems.typings import (
   CardIdx,
   Gem,
   Card,
+  GemList,
 )
 
 
@@ -22,6 +23,8 @@ def test_action_constructors_basic():
   assert isinstance(a0, NoopAction)
   assert a0.type == ActionType.NOOP
   assert str(a0) == "Action.Noop()"
+  assert Action.noop() is a0
+  assert NoopAction.from_dict(a0.to_dict()) is a0
 
   a1 = Action.take3(Gem.RED, Gem.BLUE, Gem.GREEN)
   assert isinstance(a1, Action)
@@ -29,6 +32,9 @@ def test_action_constructors_basic():
   assert a1.type == ActionType.TAKE_3_DIFFERENT
   assert a1.gems == (Gem.RED, Gem.BLUE, Gem.GREEN)
   assert str(a1) == "Action.Take3(🔴🔵🟢)"
+  assert a1.ret is GemList.EMPTY
+  assert a1.to_dict()['ret'] is None
+  assert Action.take3(Gem.RED, Gem.BLUE, Gem.GREEN, ret_map={}) == a1
 
   a2 = Action.take2(Gem.WHITE)
   assert isinstance(a2, Action)
@@ -144,3 +150,26 @@ def test_action_serialize_roundtrip():
     b = Action.deserialize(d)
     # compare serialized forms to avoid relying on object equality (GemList has no eq)
     assert b.serialize() == d
+
+
+def test_create_interns_equal_actions():
+  assert Action.take3(Gem.RED, Gem.BLUE) is Action.take3(Gem.RED, Gem.BLUE)
+  assert Action.take2(Gem.RED, ret_map={Gem.BLUE: 1}) is Action.take2(Gem.RED, ret_map={Gem.BLUE: 1})
+  assert Action.take2(Gem.RED) is not Action.take2(Gem.RED, ret_map={Gem.BLUE: 1})
+
+  card = Card(id="c1", cost={Gem.RED: 2})
+  same_id = Card(id="c1", cost={Gem.RED: 1})
+  buy = Action.buy(card, {Gem.RED: 2}, visible_idx=0)
+  assert Action.buy(card, {Gem.RED: 2}, visible_idx=0) is buy
+  assert Action.buy(same_id, {Gem.RED: 2}, visible_idx=0).card is same_id
+  assert Action.buy_gold(card, {Gem.RED: 2}, visible_idx=0) is not buy
+  assert Action.reserve(card, visible_idx=0) is Action.reserve(card, visible_idx=0)
+
+
+def test_actions_are_slotted():
+  card = Card(id="c1", cost={Gem.RED: 2})
+  gold = Action.buy_gold(card, {Gem.RED: 1}, visible_idx=0)
+  for a in (Action.take3(Gem.RED), Action.take2(Gem.RED), gold, Action.reserve(card, visible_idx=0), Action.noop()):
+    assert not hasattr(a, '__dict__')
+  d = gold.to_dict()
+  assert d['gold_payment'] == [(Gem.RED.value, 1)] and 'payment' not in d
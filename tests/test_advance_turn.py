@@ -38,3 +38,24 @@ def test_advance_turn_with_decks_refill():
   # decks should have been mutated (popped)
   assert decks[1] == []
   assert decks[2] == []
+
+  # every level with cards left is full, so the visible cards are shared
+  decks[1] = [make_card(1, 'l1c3')]
+  gs3 = GameState(config=config, players=(p,), visible_cards_in=[make_card(1, f'v{i}') for i in range(4)])
+  gs4 = gs3.advance_turn(decks_by_level=decks)
+  assert gs4.visible_cards is gs3.visible_cards
+  assert [c.id for c in decks[1]] == ['l1c3']
+
+
+def test_position_key_ignores_turn_but_not_side_to_move():
+  config = GameConfig()
+  players = (PlayerState(seat_id=0), PlayerState(seat_id=1))
+  card = make_card(1, 'a')
+  gs = GameState(config=config, players=players, visible_cards_in=(card,), turn=0)
+
+  assert gs.position_key() == gs.advance_turn().advance_turn().position_key()
+  assert gs.position_key() != gs.advance_turn().position_key()
+  hash(gs.position_key())
+  # a different card under the same id is a different position
+  other = GameState(config=config, players=players, visible_cards_in=(Card(id='a', level=1, points=3),), turn=0)
+  assert other.position_key() != gs.position_key()
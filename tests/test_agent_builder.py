@@ -1,5 +1,6 @@
 from dataclasses import asdict
 import pytest
+from pydantic import TypeAdapter
 
 from gems.agents.core import AgentBuilder, Agent
 from gems.agents.greedy import GreedyAgent, GreedyAgentEvaluationV1
@@ -29,6 +30,17 @@ def test_agent_builder_missing_kwargs_raises():
     builder.build()
 
 
+def test_agent_builder_invalid_fields_raise():
+  with pytest.raises(ValueError):
+    AgentBuilder(cls_name="", seat_id=0, name="GreedyAgent")
+  with pytest.raises(ValueError):
+    AgentBuilder(cls_name="GreedyAgent", seat_id=-1, name="GreedyAgent")
+  with pytest.raises(ValueError):
+    AgentBuilder(cls_name="GreedyAgent", seat_id=0, name=None)  # type: ignore[arg-type]
+  with pytest.raises(TypeError):
+    AgentBuilder(cls_name="GreedyAgent", seat_id=0)  # type: ignore[call-arg]
+
+
 def test_agent_builder_unknown_class_raises():
   evaluation = GreedyAgentEvaluationV1()
   builder = AgentBuilder(cls_name="NotExistAgent", seat_id=0,
@@ -46,8 +58,10 @@ def test_agent_builder_json_roundtrip():
       kwargs={"evaluation": evaluation},
       config=asdict(evaluation.config),
   )
-  data = builder.model_dump_json()
-  builder2 = AgentBuilder.model_validate_json(data)
+  adapter = TypeAdapter(AgentBuilder)
+  data = adapter.dump_json(builder)
+  assert b'kwargs' not in data
+  builder2 = adapter.validate_json(data)
   assert builder2.cls_name == builder.cls_name
   assert builder2.seat_id == builder.seat_id
   assert builder2.kwargs is None
@@ -72,3 +86,12 @@ def test_agent_builder_method_on_agent_instance():
   assert asdict(built_agent.evaluation.config) == asdict(agent.evaluation.config)
   # Evaluation object identity may or may not be preserved; ensure at least same type
   assert built_agent.evaluation.__class__ is agent.evaluation.__class__
+
+
+def test_agent_metadata_type_is_registry_key():
+  class NestedAgent(Agent):
+    pass
+
+  agent = NestedAgent(seat_id=0, seed=1, name=None)
+  assert Agent.agent_name_to_cls[agent.metadata()["type"]] is NestedAgent
+  assert agent.builder().cls_name == agent.metadata()["type"]
@@ -45,6 +45,10 @@ def test_greedy_agent_returns_one_of_legal_actions():
   chosen = agent.act(state, legal)
   assert chosen in legal
 
+  meta = agent.metadata()
+  assert meta["evaluation"] == "GreedyAgentEvaluationV1"
+  assert meta["evaluation_config"]["gem_score"] == 10.0
+
 
 def test_space_sample_agent_returns_noop_when_sampling_fails():
   from gems.agents.space_sample import SpaceSampleAgent
@@ -65,3 +69,105 @@ def test_space_sample_agent_returns_noop_when_sampling_fails():
   chosen = agent.act(state, legal)
   assert isinstance(chosen, Action)
   assert chosen.type != ActionType.NOOP
+
+
+def test_greedy_score_actions_matches_quick_score():
+  from gems.agents.greedy import GreedyAgentEvaluationV1
+
+  engine = Engine.new(num_players=2, seed=5)
+  state = engine.get_state()
+  card = state.visible_cards[0]
+  buy = Action.buy(card, payment={Gem.RED: 1, Gem.GOLD: 2}, visible_idx=0)
+  legal_actions = state.players[0].get_legal_actions(state) + legal + [buy]
+  evaluation = GreedyAgentEvaluationV1()
+
+  scores = evaluation.score_actions(state, 0, legal_actions)
+  assert list(scores) == [evaluation.quick_score(state, 0, a) for a in legal_actions]
+
+
+def test_target_score_actions_matches_quick_score():
+  from gems.agents.core import AGENT_METADATA_HISTORY_ROUND
+  from gems.agents.target import TargetAgent, TargetAgentEvaluationV1
+
+  engine = Engine.new(num_players=2, seed=5)
+  state = engine.get_state()
+  target_card = state.visible_cards[0]
+  legal_actions = state.players[0].get_legal_actions(state) + legal
+  evaluation = TargetAgentEvaluationV1()
+
+  scores = evaluation.score_actions(state, 0, target_card, legal_actions)
+  assert list(scores) == [evaluation.quick_score(state, 0, target_card, a) for a in legal_actions]
+
+  agent = TargetAgent(seat_id=0, seed=1, evaluation=evaluation)
+  assert agent.act(state, legal_actions) in legal_actions
+  meta = agent.metadata()
+  assert meta["evaluation"] == "TargetAgentEvaluationV1"
+  assert meta["evaluation_config"]["gem_score"] == 10.0
+  assert len(meta[AGENT_METADATA_HISTORY_ROUND]) == 1
+  assert TargetAgent(seat_id=1).card_history == []
+
+
+def test_greedy_agent_depth_search_matches_exhaustive_negamax():
+  from gems.agents.greedy import GreedyAgentEvaluationV1
+
+  evaluation = GreedyAgentEvaluationV1()
+
+  def value(state, depth):
+    seat = state.turn % len(state.players)
+    actions = state.players[seat].get_legal_actions(state)
+    best = -float("inf")
+    for a in actions:
+      v = evaluation.quick_score(state, seat, a)
+      if depth > 1:
+        v -= value(a.apply(state).advance_turn(), depth - 1)
+      best = max(best, v)
+    return best
+
+  engine = Engine.new(num_players=2, seed=5)
+  state = engine.get_state()
+  legal_actions = engine.get_legal_actions(0)
+  agent = GreedyAgent(seat_id=0, seed=1, evaluation=evaluation, depth=2)
+
+  chosen = agent.act(state, legal_actions)
+  assert chosen in legal_actions
+  chosen_value = evaluation.quick_score(state, 0, chosen) - value(chosen.apply(state).advance_turn(), 1)
+  assert chosen_value == value(state, 2)
+  assert agent._tt
+
+  agent.reset(seed=1)
+  assert not agent._tt
+
+  # the table is an LRU: a small bound caps it without changing the choice
+  small = GreedyAgent(seat_id=0, seed=1, evaluation=evaluation, depth=3, tt_size=8)
+  big = GreedyAgent(seat_id=0, seed=1, evaluation=evaluation, depth=3)
+  assert small.act(state, legal_actions) == big.act(state, legal_actions)
+  assert len(small._tt) == 8 < len(big._tt)
+
+
+def test_target_agent_score_cache_reuses_scores_for_same_position():
+  from gems.agents.target import TargetAgent, TargetAgentEvaluationV1
+
+  calls = []
+
+  class CountingEvaluation(TargetAgentEvaluationV1):
+    def score_actions(self, state, seat_id, target_card, actions):
+      calls.append(len(actions))
+      return super().score_actions(state, seat_id, target_card, actions)
+
+  engine = Engine.new(num_players=2, seed=5)
+  state = engine.get_state()
+  agent = TargetAgent(seat_id=0, seed=1, evaluation=CountingEvaluation(), score_cache_size=1)
+  agent.act(state, engine.get_legal_actions(0))
+  # two turns later the same position comes back with a new turn number
+  later = state.advance_turn().advance_turn()
+  agent.act(later, later.players[0].get_legal_actions(later))
+  assert len(calls) == 1
+
+  other = Action.take3(Gem.RED, Gem.BLUE, Gem.GREEN).apply(state)
+  agent.act(other, other.players[0].get_legal_actions(other))
+  agent.act(state, engine.get_legal_actions(0))
+  assert len(calls) == 3
+
+  # the same position with the actions reordered must be scored afresh
+  agent.act(state, list(reversed(engine.get_legal_actions(0))))
+  assert len(calls) == 4
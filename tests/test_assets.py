@@ -4,14 +4,24 @@ from gems.typings import Card, Role
 
 def test_load_assets_default_config():
   assets = GAME_ASSETS_DEFAULT
-  cards_by_level = assets.new_decks_by_level()
+  cards_by_level = assets.decks_by_level
   cards = [c for deck in cards_by_level.values() for c in deck]
-  roles = assets.new_roles_deck()
-  assert isinstance(cards, list)
-  assert isinstance(roles, list)
+  roles = assets.roles_deck
+  assert all(isinstance(deck, tuple) for deck in cards_by_level.values())
+  assert isinstance(roles, tuple)
   assert all(isinstance(c, Card) for c in cards)
   assert all(isinstance(r, Role) for r in roles)
   # our sample config contains 90 cards and 10 roles
   assert len(cards) == 90
   assert len(roles) == 10
   assert {level: len(deck) for level, deck in cards_by_level.items()} == {1: 40, 2: 30, 3: 20}
+
+
+def test_load_default_is_parsed_once_per_path():
+  from pathlib import Path
+  from gems.consts import GameAssets
+
+  path = Path(__file__).parent.parent / "gems" / "assets" / "config.yaml"
+  assert GameAssets.load_default() is GAME_ASSETS_DEFAULT
+  assert GameAssets.load_default(str(path)) is GAME_ASSETS_DEFAULT
+
@@ -7,7 +7,7 @@ def test_can_afford_with_discounts_happy_path():
   # Card costs 2 black and 2 blue, player has discounts: 1 black
   card = Card(id='d-1', cost=[(Gem.BLACK, 2), (Gem.BLUE, 2)])
   # player has one discount in BLACK from purchased cards
-  p = PlayerState(seat_id=0, gems=GemList(((Gem.BLACK, 1), (Gem.BLUE, 2), (Gem.GOLD, 0))), purchased_cards_in=())
+  p = PlayerState(seat_id=0, gems=GemList(((Gem.BLACK, 1), (Gem.BLUE, 2), (Gem.GOLD, 0))), purchased_cards=())
   # manually set discounts to simulate one purchased black bonus
   # Construct PlayerState with purchased_cards that produce discounts would be easier,
   # but we can directly rely on the `discounts` attribute for this focused test.
@@ -22,9 +22,49 @@ def test_can_afford_with_discounts_happy_path():
 def test_can_afford_with_discounts_makes_card_free():
   # Card costs 1 red and 1 blue, player has discounts that cover both
   card = Card(id='d-2', cost=[(Gem.RED, 1), (Gem.BLUE, 1)])
-  p = PlayerState(seat_id=0, gems=GemList(()), purchased_cards_in=())
+  p = PlayerState(seat_id=0, gems=GemList(()), purchased_cards=())
   object.__setattr__(p, 'discounts', GemList(((Gem.RED, 1), (Gem.BLUE, 1))))
 
   payments = p.can_afford(card)
   # Card is free thanks to discounts -> empty payment dict expected
   assert payments == [{}]
+
+
+def test_can_afford_enumerates_only_feasible_gold_splits():
+  card = Card(id='d-3', cost=[(Gem.RED, 3), (Gem.BLUE, 2)])
+  p = PlayerState(seat_id=0, gems=GemList(((Gem.RED, 2), (Gem.BLUE, 2), (Gem.GOLD, 2))))
+
+  # ordered as the cartesian product of colored spends, infeasible ones skipped
+  assert p.can_afford(card) == [
+      {Gem.RED: 1, Gem.BLUE: 2, Gem.GOLD: 2},
+      {Gem.RED: 2, Gem.BLUE: 1, Gem.GOLD: 2},
+      {Gem.RED: 2, Gem.BLUE: 2, Gem.GOLD: 1},
+  ]
+  poor = PlayerState(seat_id=0, gems=GemList(((Gem.RED, 1), (Gem.GOLD, 1))))
+  assert poor.can_afford(card) == []
+
+
+def test_affordable_matches_can_afford():
+  cards = [
+      Card(id='a', cost=[(Gem.RED, 3), (Gem.BLUE, 2)]),
+      Card(id='b', cost=[(Gem.RED, 4)]),
+      Card(id='c', cost=[(Gem.GREEN, 2)]),
+      Card(id='d', cost=[]),
+  ]
+  p = PlayerState(seat_id=0, gems=GemList(((Gem.RED, 2), (Gem.BLUE, 2), (Gem.GOLD, 1))),
+                  purchased_cards=(Card(id='p', bonus=Gem.RED),))
+  assert p.affordable(cards) == [bool(p.can_afford(c)) for c in cards] == [True, True, False, True]
+
+
+def test_can_afford_returns_fresh_payment_dicts():
+  card = Card(id='d-5', cost=[(Gem.RED, 2), (Gem.BLUE, 1)])
+  same_cost = Card(id='d-6', cost=[(Gem.RED, 2), (Gem.BLUE, 1)])
+  p = PlayerState(seat_id=0, gems=GemList(((Gem.RED, 2), (Gem.BLUE, 1), (Gem.GOLD, 1))))
+
+  first = p.can_afford(card)
+  expected = [dict(pay) for pay in first]
+  # callers own the dicts: mutating them leaves later results intact
+  first[0][Gem.RED] = 0
+  again = p.can_afford(same_cost)
+  assert again == expected
+  assert all(type(pay) is dict for pay in again)
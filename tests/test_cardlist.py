@@ -17,6 +17,7 @@ def test_get_level_filters():
 
   lvl2 = cl.get_level(2)
   assert [c.id for c in lvl2] == ['b']
+  assert cl.get_level(1) is lvl1
 
   lvl_missing = cl.get_level(99)
   assert list(lvl_missing) == []
@@ -10,6 +10,7 @@ def test_engine_init_and_get_state():
   assert isinstance(state, GameState)
   assert len(state.players) == 2
   assert state.turn == 0
+  assert not hasattr(e, '__dict__')
 
 
 def test_engine_reset_changes_state():
@@ -18,8 +19,78 @@ def test_engine_reset_changes_state():
   s = e.get_state()
   assert s.players[0].name == "X"
   assert s.players[1].name == "Y"
+  # immutable starting states are shared between identical resets
+  e.reset(["X", "Y"])
+  assert e.get_state() is s
+  e.reset(["Z", "Y"])
+  assert e.get_state().players[0].name == "Z"
+
+
+def test_engine_reset_shares_initial_decks():
+  e = Engine.new(2, seed=5)
+  decks = e.decks_by_level
+  e.draw_from_deck(1, 3)
+  e.reset()
+  assert e.decks_by_level is decks
+  assert e.decks_by_level[1] is e._initial_assets.decks_by_level[1]
+  assert e.roles_deck is e._initial_assets.roles_deck
+
+
+def test_print_summary_writes_whole_summary(capsys):
+  e = Engine.new(2, ["A", "B"], seed=1)
+  e.print_summary()
+  out = capsys.readouterr().out
+  assert out.startswith("--" * 20 + "\nRound: 0 Turn: 0\nPlayers:\n")
+  assert "  seat=1 name='B' score=0" in out
+  assert "\nVisible cards:\n" in out and out.endswith("\n")
+
+
+def test_play_one_round_is_quiet_unless_debug(capsys):
+  from gems.agents.random import RandomAgent
+
+  e = Engine.new(2, seed=2)
+  agents = [RandomAgent(i, seed=i) for i in range(2)]
+  e.play_one_round(agents)
+  assert capsys.readouterr().out == ""
+  e.play_one_round(agents, debug=True)
+  out = capsys.readouterr().out
+  assert out.startswith("Turn 2 — player 0 performs: ")
+  assert out.count("Visible cards:\n") == 2
 
 
 def test_init_game_invalid_count_raises():
   with pytest.raises(ValueError):
     Engine.new(0)
+
+
+def test_engine_pool_reuses_released_engines():
+  from gems.agents.random import RandomAgent
+  from gems.engine_pool import EnginePool
+
+  e = Engine.new(2, seed=3)
+  agents = [RandomAgent(i, seed=i) for i in range(2)]
+  e.play_one_round(agents, debug=False)
+
+  pool = EnginePool(max_size=1)
+  first = pool.clone(e, seed=1)
+  first.play_one_round(agents, debug=False)
+  pool.release(first)
+  pool.release(Engine.new(2))
+  assert len(pool) == 1
+
+  second = pool.clone(e, seed=1)
+  expected = e.clone(seed=1)
+  assert second is first
+  assert len(pool) == 0
+  assert second.get_state() is e.get_state()
+  assert second.decks_by_level == expected.decks_by_level
+  assert second.decks_by_level is not e.decks_by_level
+  assert second.roles_deck == expected.roles_deck
+  assert second._action_history == expected._action_history
+  assert second._rng.random() == expected._rng.random()
+
+  pool.release(second)
+  with pool.borrow(e, seed=2) as third:
+    assert third is second
+    assert third.get_state() is e.get_state()
+  assert len(pool) == 1
@@ -117,8 +117,8 @@ def test_state_space_obs():
   bank[Gem.GOLD] = 2
 
   # player 0 has some gems and a purchased card that grants a discount (bonus)
-  p0 = PlayerState(seat_id=0, name='A', gems_in={Gem.RED: 1, Gem.BLUE: 0, Gem.GOLD: 1}, score=7,
-                   reserved_cards_in=(), purchased_cards_in=(cards[0],))
+  p0 = PlayerState(seat_id=0, name='A', gems={Gem.RED: 1, Gem.BLUE: 0, Gem.GOLD: 1}, score=7,
+                   reserved_cards=(), purchased_cards=(cards[0],))
   # player 1 default
   p1 = engine.get_state().players[1]
 
@@ -276,3 +276,40 @@ def test_sample_action_dict():
     action = aspace.decode(d) # type: ignore
     assert isinstance(action, Action)
     assert action._check_without_state(config)
+
+  batch = aspace.sample_batch(200)
+  assert len(batch) == 200
+  for d in batch:
+    action = aspace.decode(d)
+    assert action.type == aspace._type_order[int(d['type'])]
+    assert action._check_without_state(config)
+    assert aspace.validate(d)
+
+
+def test_validate_checks_card_idx_against_state():
+  from gems.engine import Engine
+  from gems.typings import ActionType
+
+  config = GameConfig(num_players=2)
+  aspace = ActionSpace(config)
+  state = Engine.create_game(config=config)
+
+  d = aspace.empty()
+  d['type'][...] = aspace._type_index[ActionType.BUY_CARD]
+  # flat index 0 is reserve_idx=0, which a fresh player does not have
+  d['buy']['card_idx'][...] = 0
+  assert aspace.validate(d)
+  assert not aspace.validate(d, state, 0)
+
+  d['buy']['card_idx'][...] = config.card_max_count_reserved
+  assert aspace.validate(d, state, 0) == (len(state.visible_cards) > 0)
+
+  # the top of a deck can be reserved, but never bought
+  deck_head = config.card_max_count_reserved + config.card_visible_total_count
+  d['buy']['card_idx'][...] = deck_head
+  assert not aspace.validate(d, state, 0)
+  d['type'][...] = aspace._type_index[ActionType.RESERVE_CARD]
+  d['reserve']['card_idx'][...] = deck_head
+  assert aspace.validate(d, state, 0)
+  assert aspace.validate(d, state, 0, deck_sizes={1: 3})
+  assert not aspace.validate(d, state, 0, deck_sizes={1: 0})
@@ -1,7 +1,7 @@
 import math
 import pytest
 from gems import Engine
-from gems.actions import Action, Take2Action
+from gems.actions import Action, Take2Action, Take3Action
 from gems.consts import GameConfig
 from gems.typings import ActionType, Gem, Card, GemList
 from gems.state import PlayerState, GameState
@@ -140,7 +140,7 @@ def test_player_can_buy_own_reserved_card():
   e = Engine.new(2)
   card = Card(id='res-1', cost=[(Gem.BLACK, 1)])
   # player 0 has the exact gem to buy the reserved card
-  p0 = PlayerState(seat_id=0, gems=GemList(((Gem.BLACK, 1),)), reserved_cards_in=(card,))
+  p0 = PlayerState(seat_id=0, gems=GemList(((Gem.BLACK, 1),)), reserved_cards=(card,))
   p1 = PlayerState(seat_id=1, gems=GemList(()))
   state = GameState(config=e.config, players=(p0, p1), bank=e.get_state().bank, visible_cards_in=(), turn=0)
   e._state = state
@@ -207,6 +207,10 @@ def test_take3_no_return_needed_enumerates_combos():
   assert len(take3) == 10
   # none should include a return payload
   assert all((not getattr(a, 'ret', None)) for a in take3)
+  # the combos follow GEM_ORDER and are reused across positions
+  assert take3[0].gems == (Gem.RED, Gem.BLUE, Gem.WHITE)
+  again = Take3Action._get_legal_actions(p0, state, e.config)
+  assert all(a is b for a, b in zip(again, take3))
 
 
 def test_take3_with_required_returns_enumerated():
@@ -377,3 +381,57 @@ def test_reserve_with_return_enumerated_and_apply():
   assert dict(new_p0.gems).get(Gem.GOLD, 0) == 1
   # bank gained the returned token
   assert dict(new_state.bank).get(chosen.ret, 0) == dict(state.bank).get(chosen.ret, 0) + 1
+
+
+def test_get_legal_actions_repeated_call_returns_fresh_copy():
+  e = Engine.new(2, seed=5)
+  state = e.get_state()
+  first = state.players[0].get_legal_actions(state)
+  first.clear()
+  second = state.players[0].get_legal_actions(state)
+  assert second == e.get_legal_actions(seat_id=0)
+  assert second and second is not first
+  # positions that differ only in the other players' holdings share the list
+  from dataclasses import replace
+  from gems.state import _LEGAL_ACTIONS_CACHE
+  rich = replace(state.players[1], gems=GemList({Gem.RED: 3}), score=4)
+  other = GameState(config=state.config, players=(state.players[0], rich), bank=state.bank,
+                    visible_cards=state.visible_cards, turn=state.turn)
+  cached = len(_LEGAL_ACTIONS_CACHE)
+  assert other.players[0].get_legal_actions(other) == second
+  assert len(_LEGAL_ACTIONS_CACHE) == cached
+
+
+def test_get_legal_actions_cache_tells_apart_cards_sharing_an_id():
+  e = Engine.new(2)
+  p0 = PlayerState(seat_id=0, gems=GemList(((Gem.RED, 1),)))
+  cheap = Card(id='x', level=1, points=0, cost=((Gem.RED, 1),))
+  dear = Card(id='x', level=1, points=5, cost=((Gem.RED, 9),))
+  actions = []
+  for card in (cheap, dear):
+    state = GameState(config=e.config, players=(p0, PlayerState(seat_id=1)), bank=e.get_state().bank,
+                      visible_cards_in=(card,), turn=0)
+    actions.append(p0.get_legal_actions(state))
+  reserves = [[a for a in acts if a.type == ActionType.RESERVE_CARD] for acts in actions]
+  assert reserves[0][0].card is cheap
+  assert reserves[1][0].card is dear
+  assert any(a.type == ActionType.BUY_CARD for a in actions[0])
+  assert not any(a.type == ActionType.BUY_CARD for a in actions[1])
+
+
+def test_iter_legal_actions_yields_buys_first():
+  e = Engine.new(2, seed=3)
+  p0 = PlayerState(seat_id=0, gems=GemList(((Gem.RED, 3), (Gem.BLUE, 3), (Gem.WHITE, 2), (Gem.GOLD, 2))))
+  state = GameState(config=e.config, players=(p0, e.get_state().players[1]), bank=e.get_state().bank,
+                    visible_cards_in=e.get_state().visible_cards, turn=0)
+  e._state = state
+
+  lazy = list(e.iter_legal_actions())
+  assert sorted(map(str, lazy)) == sorted(map(str, e.get_legal_actions()))
+  types = [a.type for a in lazy]
+  assert types[0] == ActionType.BUY_CARD
+  assert types.index(ActionType.TAKE_3_DIFFERENT) > max(i for i, t in enumerate(types) if t == ActionType.BUY_CARD)
+
+  empty = GameState(config=e.config, players=(PlayerState(seat_id=0), PlayerState(seat_id=1)),
+                    bank=GemList(()), visible_cards_in=(), turn=0)
+  assert [a.type for a in empty.players[0].iter_legal_actions(empty)] == [ActionType.NOOP]
@@ -10,6 +10,9 @@ def test_deterministic_shuffle_same_seed():
     d1 = e1.get_deck(lvl)
     d2 = e2.get_deck(lvl)
     assert [c.id for c in d1] == [c.id for c in d2]
+  # the seeded shuffle is computed once and shared; each engine draws from its own mapping
+  assert e1._initial_assets is e2._initial_assets
+  assert e1.decks_by_level is not e2.decks_by_level
 
 
 def test_draw_and_peek_behavior():
@@ -17,6 +20,7 @@ def test_draw_and_peek_behavior():
 
   lvl = 1
   deck_before = e.get_deck(lvl)
+  assert isinstance(deck_before, tuple)
   assert len(deck_before) > 2
 
   top_peek = e.peek_deck(lvl, 2)
@@ -28,3 +32,17 @@ def test_draw_and_peek_behavior():
 
   # deck size should be reduced by 2
   assert len(e.get_deck(lvl)) == len(deck_before) - 2
+  # a clone shares the decks, and draws in either engine leave the other's alone
+  clone = e.clone()
+  assert clone.get_deck(lvl) is e.get_deck(lvl)
+  clone.draw_from_deck(lvl, 1)
+  assert len(e.get_deck(lvl)) == len(deck_before) - 2
+
+
+def test_draw_more_than_deck_empties_it():
+  e = Engine.new(2, seed=7)
+  deck = list(e.get_deck(3))
+  assert e.draw_from_deck(3, len(deck) + 5) == deck[::-1]
+  assert e.get_deck(3) == ()
+  assert e.draw_from_deck(3, 2) == []
+  assert e.draw_from_deck(1, 0) == []
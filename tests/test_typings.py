@@ -15,6 +15,27 @@ def test_gem_list_init():
   gl4 = GemList()
   assert dict(gl4) == {}
 
+  gl5 = GemList({Gem.RED: 2, Gem.GOLD: 1, Gem.BLUE: 3})
+  assert gl5.count() == 6
+  assert gl5.count() == 6 and gl4.count() == 0
+
+  arr = gl5.as_array()
+  assert arr.tolist() == [gl5.get(g) for g in GemList.GEM_ORDER]
+  assert gl5.as_array() is arr
+  assert not arr.flags.writeable
+
+  counts = gl5.counts()
+  assert counts == tuple(arr.tolist())
+  assert gl5.counts() is counts
+  assert [(g, n) for g, _, n in gl5.indexed()] == list(gl5)
+  assert all(GemList.GEM_ORDER[i] == g for g, i, _ in gl5.indexed())
+
+  packed = gl5.packed()
+  assert packed is not None
+  for g in GemList.GEM_ORDER:
+    assert (packed >> (16 * GemList.GEM_ORDER.index(g))) & 0xFFFF == gl5.get(g)
+  assert GemList({Gem.RED: -1}).packed() is None
+
 
 def test_card_init():
   c = Card(id="c1", name="C", level=2, points=2, bonus=Gem.GREEN, cost=[(Gem.RED, 2)])
@@ -45,7 +66,7 @@ def test_role_roundtrip():
 def test_playerstate_discounts_empty_and_aggregate():
   # empty purchased cards -> no discounts
   from gems.state import PlayerState
-  p0 = PlayerState(seat_id=0, purchased_cards_in=[])
+  p0 = PlayerState(seat_id=0, purchased_cards=[])
   assert tuple(p0.purchased_cards) == ()
   assert tuple(p0.discounts) == ()
 
@@ -53,7 +74,7 @@ def test_playerstate_discounts_empty_and_aggregate():
   c1 = Card(id='a', bonus=Gem.GREEN)
   c2 = Card(id='b', bonus=Gem.GREEN)
   c3 = Card(id='c', bonus=Gem.RED)
-  p1 = PlayerState(seat_id=1, purchased_cards_in=[c1, c2, c3])
+  p1 = PlayerState(seat_id=1, purchased_cards=[c1, c2, c3])
   # discounts is a tuple of (Gem, count) pairs; convert to dict for easy asserts
   discounts_map = dict(p1.discounts)
   assert discounts_map[Gem.GREEN] == 2